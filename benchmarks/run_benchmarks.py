@@ -0,0 +1,353 @@
+"""Reproducible throughput, latency and memory benchmarks of the client and the transcript converters.
+
+Everything runs offline: the client is measured against the local service emulator, started in a
+separate process so that it does not compete with the client for the GIL. Results are printed, or
+written with --output, as JSON.
+
+    python benchmarks/run_benchmarks.py --output benchmark_results.json
+    python benchmarks/run_benchmarks.py client --concurrency 1,8,32 --operations 400
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+import requests
+
+REPOSITORY_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(REPOSITORY_ROOT))
+
+from python.content_understanding_client import AzureContentUnderstandingClient  # noqa: E402
+from python.extension.transcripts_processor import (  # noqa: E402
+    BatchTranscriptionProcessor,
+    FastTranscriptionProcessor,
+)
+from python.results import decode_operation_result  # noqa: E402
+
+SEED = 1234
+SUITES = ("client", "parsing", "transcripts")
+
+
+def percentile(sorted_values, fraction):
+    """Returns the nearest-rank percentile of sorted values."""
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[rank]
+
+
+def summarize_latencies(latencies):
+    latencies = sorted(latencies)
+    return {
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p90_ms": percentile(latencies, 0.90) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": latencies[-1] * 1000,
+    }
+
+
+@contextmanager
+def run_emulator(processing_seconds, latency_ms):
+    """Starts the service emulator in a subprocess and yields its endpoint."""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "python.cu_emulator", "--port", str(port),
+            "--processing-seconds", str(processing_seconds), "--latency-ms", str(latency_ms),
+        ],
+        cwd=REPOSITORY_ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    endpoint = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.time() + 10
+        while True:
+            try:
+                requests.get(f"{endpoint}/emulator/stats", timeout=1)
+                break
+            except requests.exceptions.ConnectionError:
+                if time.time() > deadline or process.poll() is not None:
+                    raise RuntimeError("The service emulator did not start.")
+                time.sleep(0.05)
+        yield endpoint
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def get_emulator_requests(endpoint):
+    return requests.get(f"{endpoint}/emulator/stats", timeout=10).json()["requests"]
+
+
+def benchmark_client(endpoint, concurrency_levels, operations):
+    """Measures submit + poll round trips against the emulator at several concurrency levels."""
+    results = []
+    payload = b"x" * 1024
+    for concurrency in concurrency_levels:
+        client = AzureContentUnderstandingClient(
+            endpoint,
+            "2024-12-01-preview",
+            subscription_key="benchmark",
+            x_ms_useragent="cu-benchmark",
+            pool_maxsize=concurrency,
+        )
+
+        def run_operation(_):
+            start = time.perf_counter()
+            response = client.begin_analyze("benchmark", payload)
+            submitted = time.perf_counter()
+            client.poll_result(response, polling_interval_seconds=0.01)
+            return submitted - start, time.perf_counter() - start
+
+        with client, ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(run_operation, range(concurrency)))  # warm up connections
+            requests_before = get_emulator_requests(endpoint)
+            start = time.perf_counter()
+            timings = list(executor.map(run_operation, range(operations)))
+            elapsed = time.perf_counter() - start
+        sent_requests = get_emulator_requests(endpoint) - requests_before
+        results.append(
+            {
+                "concurrency": concurrency,
+                "operations": operations,
+                "elapsed_seconds": elapsed,
+                "operations_per_second": operations / elapsed,
+                "requests_per_second": sent_requests / elapsed,
+                "submit_latency": summarize_latencies([submit for submit, _ in timings]),
+                "operation_latency": summarize_latencies([total for _, total in timings]),
+            }
+        )
+        print(f"client concurrency={concurrency}: {operations / elapsed:.0f} ops/s", file=sys.stderr)
+    return results
+
+
+def make_result_payload(contents, phrases_per_content):
+    """Builds the raw payload of a large audio/video result."""
+    random.seed(SEED)
+    payload = {
+        "id": "benchmark",
+        "status": "Succeeded",
+        "result": {
+            "analyzerId": "benchmark",
+            "warnings": [],
+            "contents": [
+                {
+                    "kind": "audioVisual",
+                    "startTimeMs": index * 60000,
+                    "endTimeMs": (index + 1) * 60000,
+                    "markdown": "WEBVTT\n" * 50,
+                    "fields": {"summary": {"type": "string", "valueString": "lorem ipsum " * 20}},
+                    "transcriptPhrases": [
+                        {
+                            "speaker": f"Speaker {random.randint(1, 4)}",
+                            "startTimeMs": index * 60000 + phrase * 100,
+                            "endTimeMs": index * 60000 + phrase * 100 + 90,
+                            "text": "the quick brown fox jumps over the lazy dog",
+                            "confidence": random.random(),
+                            "words": [],
+                        }
+                        for phrase in range(phrases_per_content)
+                    ],
+                }
+                for index in range(contents)
+            ],
+        },
+    }
+    return json.dumps(payload).encode("utf-8")
+
+
+def measure(function, body):
+    """Returns the duration of a call on a payload and, from a second call under tracemalloc, the
+    memory it retains and its peak.
+
+    The second call gets a copy of the payload allocated under tracemalloc, so results that keep
+    the payload have it counted in their retained memory.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    function(body)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    retained = function(bytes(bytearray(body)))
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del retained
+    return elapsed, current, peak
+
+
+def benchmark_result_parsing(contents, phrases_per_content):
+    """Measures the time and memory of decoding a large result in every result format.
+
+    The retained memory includes the payload for the formats keeping it.
+    """
+    body = make_result_payload(contents, phrases_per_content)
+    results = []
+    cases = [
+        (result_format, lambda payload, result_format=result_format: decode_operation_result(payload, result_format)[1])
+        for result_format in ("json", "lazy", "model")
+    ]
+    try:
+        import ijson  # noqa: F401
+
+        from python.result_stream import ChunkReader, iter_result_events
+
+        def stream(payload):
+            chunks = (payload[i : i + 65536] for i in range(0, len(payload), 65536))
+            for _ in iter_result_events(ChunkReader(b"", chunks)):
+                pass
+
+        cases.append(("stream", stream))
+    except ImportError:
+        print("ijson is not installed, skipping the streaming case.", file=sys.stderr)
+    for name, function in cases:
+        elapsed, retained_bytes, peak_bytes = measure(function, body)
+        results.append(
+            {
+                "format": name,
+                "payload_bytes": len(body),
+                "seconds": elapsed,
+                "retained_bytes": retained_bytes,
+                "peak_bytes": peak_bytes,
+            }
+        )
+        print(f"parsing {name}: {elapsed * 1000:.0f} ms, peak {peak_bytes / 1e6:.0f} MB", file=sys.stderr)
+    return results
+
+
+def make_batch_transcript(phrases):
+    random.seed(SEED)
+    return {
+        "durationInTicks": phrases * 30_000_000,
+        "combinedRecognizedPhrases": [],
+        "recognizedPhrases": [
+            {
+                "speaker": random.randint(1, 4),
+                "offsetInTicks": index * 30_000_000 + random.randint(0, 9_999),
+                "durationInTicks": random.randint(5_000_000, 29_000_000),
+                "nBest": [{"display": "The quick brown fox jumps over the lazy dog."}],
+            }
+            for index in range(phrases)
+        ],
+    }
+
+
+def make_fast_transcript(phrases):
+    random.seed(SEED)
+    return {
+        "durationMilliseconds": phrases * 3000,
+        "combinedPhrases": [],
+        "phrases": [
+            {
+                "speaker": random.randint(1, 4),
+                "offsetMilliseconds": index * 3000 + random.randint(0, 999),
+                "durationMilliseconds": random.randint(500, 2900),
+                "text": "The quick brown fox jumps over the lazy dog.",
+            }
+            for index in range(phrases)
+        ],
+    }
+
+
+def benchmark_transcripts(sizes):
+    """Times the WebVTT conversion of synthetic batch and fast transcriptions."""
+    results = []
+    cases = (
+        ("batch_transcription", BatchTranscriptionProcessor(), make_batch_transcript),
+        ("fast_transcription", FastTranscriptionProcessor(), make_fast_transcript),
+    )
+    for name, processor, make_transcript in cases:
+        for size in sizes:
+            transcript = make_transcript(size)
+            gc.collect()
+            start = time.perf_counter()
+            output = processor.process_transcript(transcript)
+            elapsed = time.perf_counter() - start
+            results.append(
+                {
+                    "processor": name,
+                    "phrases": size,
+                    "seconds": elapsed,
+                    "phrases_per_second": size / elapsed,
+                    "output_bytes": len(output.encode("utf-8")),
+                }
+            )
+            print(f"{name} phrases={size}: {elapsed:.3f} s", file=sys.stderr)
+            del transcript, output
+    return results
+
+
+def parse_int_list(value):
+    return [int(item) for item in value.split(",") if item]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "suites",
+        nargs="*",
+        help="The suites to run among client, parsing and transcripts. Defaults to all of them.",
+    )
+    parser.add_argument("--output", help="The JSON file to write. Defaults to standard output.")
+    parser.add_argument("--concurrency", type=parse_int_list, default=[1, 4, 16, 64])
+    parser.add_argument("--operations", type=int, default=500, help="Operations per concurrency level.")
+    parser.add_argument("--processing-seconds", type=float, default=0, help="Emulated processing time per operation.")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Emulated latency per request.")
+    parser.add_argument(
+        "--endpoint",
+        help="The endpoint of an emulator started separately, e.g. on another machine. Defaults to starting one.",
+    )
+    parser.add_argument("--result-contents", type=int, default=100, help="Contents of the parsed result.")
+    parser.add_argument("--result-phrases", type=int, default=500, help="Transcript phrases per content.")
+    parser.add_argument("--transcript-sizes", type=parse_int_list, default=[1_000, 10_000, 100_000, 1_000_000])
+    args = parser.parse_args(argv)
+    suites = args.suites or list(SUITES)
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        parser.error(f"unknown suites: {', '.join(sorted(unknown))}")
+
+    report = {
+        "environment": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "parameters": {key: value for key, value in vars(args).items() if key != "output"},
+    }
+    if "client" in suites:
+        if args.endpoint:
+            report["client"] = benchmark_client(args.endpoint, args.concurrency, args.operations)
+        else:
+            with run_emulator(args.processing_seconds, args.latency_ms) as endpoint:
+                report["client"] = benchmark_client(endpoint, args.concurrency, args.operations)
+    if "parsing" in suites:
+        report["parsing"] = benchmark_result_parsing(args.result_contents, args.result_phrases)
+    if "transcripts" in suites:
+        report["transcripts"] = benchmark_transcripts(args.transcript_sizes)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
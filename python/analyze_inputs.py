@@ -0,0 +1,93 @@
+import hashlib
+import os
+from pathlib import Path
+
+BINARY_TYPES = (bytes, bytearray, memoryview)
+
+
+def is_url(file_location) -> bool:
+    """Returns whether the input of an analyze call is a URL the service downloads itself."""
+    return isinstance(file_location, str) and (
+        "https://" in file_location or "http://" in file_location
+    )
+
+
+def is_stream(file_location) -> bool:
+    """Returns whether the input of an analyze call is an open binary stream."""
+    return hasattr(file_location, "read")
+
+
+def as_bytes_like(data):
+    """Returns in-memory content as a flat byte buffer to send or hash.
+
+    Contiguous buffers are viewed without a copy; non-contiguous views, such as strided
+    slices of arrays, cannot be sent as one block and are copied.
+
+    Args:
+        data (bytes | bytearray | memoryview): The content of the analyze call.
+    Returns:
+        bytes | memoryview: The content as bytes or a one-dimensional view of unsigned bytes.
+    """
+    if isinstance(data, bytes):
+        return data
+    view = memoryview(data)
+    if not view.contiguous:
+        return view.tobytes()
+    return view.cast("B")
+
+
+def describe_input(file_location) -> str:
+    """Returns a short, loggable description of the input of an analyze call.
+
+    In-memory content and streams are described rather than rendered, so logging never
+    copies or prints the payload.
+    """
+    if isinstance(file_location, BINARY_TYPES):
+        return f"<{memoryview(file_location).nbytes} bytes>"
+    if is_stream(file_location):
+        return f"<stream {getattr(file_location, 'name', type(file_location).__name__)}>"
+    return str(file_location)
+
+
+def get_input_name(file_location) -> str:
+    """Returns the path, URL or stream file name of an input, or "" for in-memory content."""
+    if is_stream(file_location):
+        file_location = getattr(file_location, "name", "")
+    if isinstance(file_location, (str, os.PathLike)):
+        return os.fspath(file_location)
+    return ""
+
+
+def is_local_file(file_location) -> bool:
+    """Returns whether the input of an analyze call is the path of an existing local file."""
+    return isinstance(file_location, (str, os.PathLike)) and Path(file_location).exists()
+
+
+def get_content_digest(file_location, chunk_size: int = 1 << 20) -> str:
+    """Returns a SHA-256 digest of the content of a local input, reading files in chunks.
+
+    Seekable streams are hashed from their current position and rewound afterwards.
+
+    Args:
+        file_location (str | Path | BinaryIO | bytes | bytearray | memoryview): The input of the analyze call.
+        chunk_size (int, optional): The number of bytes read at a time. Defaults to 1 MiB.
+    Returns:
+        str: The digest as "sha256:<hex>", or None for URLs and streams that cannot be rewound.
+    """
+    digest = hashlib.sha256()
+    if isinstance(file_location, BINARY_TYPES):
+        digest.update(as_bytes_like(file_location))
+    elif is_stream(file_location):
+        if not (hasattr(file_location, "seekable") and file_location.seekable()):
+            return None
+        position = file_location.tell()
+        for chunk in iter(lambda: file_location.read(chunk_size), b""):
+            digest.update(chunk)
+        file_location.seek(position)
+    elif is_local_file(file_location):
+        with open(file_location, "rb") as file:
+            for chunk in iter(lambda: file.read(chunk_size), b""):
+                digest.update(chunk)
+    else:
+        return None
+    return f"sha256:{digest.hexdigest()}"
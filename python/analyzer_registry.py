@@ -0,0 +1,101 @@
+import hashlib
+import json
+import threading
+import time
+
+
+class _RegistryEntry:
+    __slots__ = ("definition", "etag", "fetched_at", "_fingerprint")
+
+    def __init__(self, definition, etag, fetched_at):
+        self.definition = definition
+        self.etag = etag
+        self.fetched_at = fetched_at
+        self._fingerprint = None
+
+    @property
+    def fingerprint(self):
+        if self._fingerprint is None and self.definition is not None:
+            self._fingerprint = hashlib.sha256(
+                json.dumps(self.definition, sort_keys=True).encode("utf-8")
+            ).hexdigest()
+        return self._fingerprint
+
+
+class AnalyzerRegistry:
+    """In-process cache of analyzer definitions, revalidated with their ETag once stale.
+
+    A definition younger than `ttl_seconds` is served without calling the service. A stale one
+    is revalidated with a conditional request, which costs a round trip but no payload when the
+    analyzer is unchanged. Missing analyzers are cached too, so existence checks of unknown IDs
+    are not repeated within the TTL. Changes made through the owning client invalidate its entries.
+    """
+
+    def __init__(self, client, ttl_seconds: float = 300):
+        """
+        Args:
+            client (AzureContentUnderstandingClient): The client used to fetch definitions.
+            ttl_seconds (float, optional): How long a definition is served without revalidation. Defaults to 300.
+        """
+        self._client = client
+        self.ttl_seconds = ttl_seconds
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, analyzer_id: str) -> dict:
+        """Returns the definition of an analyzer, or None if it does not exist."""
+        return self._get_entry(analyzer_id).definition
+
+    def exists(self, analyzer_id: str) -> bool:
+        """Returns whether an analyzer exists."""
+        return self._get_entry(analyzer_id).definition is not None
+
+    def get_fingerprint(self, analyzer_id: str) -> str:
+        """Returns a digest of the definition of an analyzer, or None if it does not exist."""
+        return self._get_entry(analyzer_id).fingerprint
+
+    def invalidate(self, analyzer_id: str = None):
+        """Forgets one analyzer, or every analyzer when no ID is given."""
+        with self._lock:
+            if analyzer_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(analyzer_id, None)
+
+    def preload(self) -> int:
+        """Caches the definition of every analyzer of the resource from the paginated listing.
+
+        Analyzers absent from the listing are not cached as missing, since the listing may change
+        while it is paged through.
+
+        Returns:
+            int: The number of analyzers cached.
+        """
+        now = time.time()
+        entries = {
+            analyzer["analyzerId"]: _RegistryEntry(analyzer, None, now)
+            for analyzer in self._client.iter_analyzers()
+        }
+        with self._lock:
+            self._entries.update(entries)
+        return len(entries)
+
+    def _get_entry(self, analyzer_id):
+        with self._lock:
+            entry = self._entries.get(analyzer_id)
+        now = time.time()
+        if entry is not None and now - entry.fetched_at < self.ttl_seconds:
+            return entry
+        response = self._client._get_analyzer_response(
+            analyzer_id, etag=entry.etag if entry is not None else None
+        )
+        if response.status_code == 304:
+            entry.fetched_at = now
+            return entry
+        if response.status_code == 404:
+            entry = _RegistryEntry(None, None, now)
+        else:
+            entry = _RegistryEntry(response.json(), response.headers.get("ETag"), now)
+        with self._lock:
+            self._entries[analyzer_id] = entry
+        return entry
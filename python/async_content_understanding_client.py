@@ -0,0 +1,557 @@
+import aiohttp
+import asyncio
+import itertools
+import logging
+import json
+import time
+from pathlib import Path
+
+from .analyze_inputs import (
+    BINARY_TYPES,
+    as_bytes_like,
+    describe_input,
+    is_local_file,
+    is_stream,
+    is_url,
+)
+from .polling import (
+    ExponentialBackoffPolling,
+    get_media_type,
+    get_poll_delay,
+    get_polling_strategy,
+    parse_retry_after,
+)
+from .results import decode_operation_result
+from .throttling import RETRYABLE_STATUS_CODES, TokenBucketRateLimiter
+from .token_cache import TokenCache
+
+
+class AsyncAzureContentUnderstandingClient:
+    def __init__(
+        self,
+        endpoint: str,
+        api_version: str,
+        subscription_key: str = None,
+        token_provider: callable = None,
+        x_ms_useragent: str = "cu-sample-code",
+        max_concurrency: int = 64,
+        connection_limit: int = 100,
+        connection_limit_per_host: int = 0,
+        keepalive_timeout_seconds: float = 30,
+        connect_timeout_seconds: float = 10,
+        read_timeout_seconds: float = 60,
+        token_refresh_margin_seconds: float = 300,
+        max_retries: int = 3,
+        rate_limiter: TokenBucketRateLimiter = None,
+    ):
+        """
+        Args:
+            endpoint (str): The endpoint of the content understanding service.
+            api_version (str): The API version to use.
+            subscription_key (str, optional): The subscription key for the service.
+            token_provider (callable, optional): A callable returning a bearer token for the service.
+            x_ms_useragent (str, optional): The user agent reported to the service for sample usage telemetry.
+            max_concurrency (int, optional): The maximum number of HTTP requests in flight at once.
+                Operations waiting between polls do not count against it. Defaults to 64.
+            connection_limit (int, optional): The total number of pooled connections. Defaults to 100.
+            connection_limit_per_host (int, optional): The number of pooled connections per host,
+                0 for no per-host limit. Defaults to 0.
+            keepalive_timeout_seconds (float, optional): How long idle connections are kept alive. Defaults to 30.
+            connect_timeout_seconds (float, optional): The timeout for establishing a connection. Defaults to 10.
+            read_timeout_seconds (float, optional): The timeout between bytes received from the service. Defaults to 60.
+            token_refresh_margin_seconds (float, optional): How long before expiry the token from `token_provider`
+                is refreshed, without blocking requests. Defaults to 300.
+            max_retries (int, optional): The number of times a throttled (429/503) request is retried. Defaults to 3.
+            rate_limiter (TokenBucketRateLimiter, optional): Limits the rate of all requests of the client, and of
+                any other client sharing it. Defaults to None.
+        """
+        if not subscription_key and not token_provider:
+            raise ValueError(
+                "Either subscription key or token provider must be provided."
+            )
+        if not api_version:
+            raise ValueError("API version must be provided.")
+        if not endpoint:
+            raise ValueError("Endpoint must be provided.")
+        if max_concurrency < 1:
+            raise ValueError("Max concurrency must be at least 1.")
+
+        self._endpoint = endpoint.rstrip("/")
+        self._api_version = api_version
+        self._logger = logging.getLogger(__name__)
+        self._static_headers = self._get_headers(subscription_key, x_ms_useragent)
+        self._token_cache = (
+            None
+            if subscription_key
+            else TokenCache(token_provider, refresh_margin_seconds=token_refresh_margin_seconds)
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._connection_limit = connection_limit
+        self._connection_limit_per_host = connection_limit_per_host
+        self._keepalive_timeout = keepalive_timeout_seconds
+        self._timeout = aiohttp.ClientTimeout(
+            sock_connect=connect_timeout_seconds, sock_read=read_timeout_seconds
+        )
+        self._session = None
+        self._max_retries = max_retries
+        self._retry_backoff = ExponentialBackoffPolling(initial_seconds=1, max_seconds=60)
+        self._rate_limiter = rate_limiter
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """Stops the token refresh and closes the pooled connections held by the client."""
+        if self._token_cache is not None:
+            self._token_cache.close()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self):
+        """Returns the HTTP session of the client, creating it on the running event loop."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self._connection_limit,
+                limit_per_host=self._connection_limit_per_host,
+                keepalive_timeout=self._keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=self._timeout
+            )
+        return self._session
+
+    async def _send_request(self, method, url, open_body=None, **kwargs):
+        """Sends an HTTP request once the rate limiter and a concurrency slot allow it.
+
+        The response body is read in full, which returns the connection to the pool,
+        so `json()` and `read()` remain usable on the returned response. Responses with
+        status 429 or 503 are retried up to `max_retries` times, waiting for the `Retry-After`
+        sent by the service or an exponential backoff. aiohttp consumes and closes stream
+        bodies, so they are only retried when `open_body` can reopen them.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The URL of the request.
+            open_body (callable, optional): Opens a fresh binary stream to send as the body of each attempt.
+            **kwargs: Additional arguments passed to `aiohttp.ClientSession.request`.
+
+        Returns:
+            aiohttp.ClientResponse: The response from the service.
+        """
+        retryable = open_body is not None or not is_stream(kwargs.get("data"))
+        attempt = 0
+        while True:
+            if self._rate_limiter is not None:
+                delay = self._rate_limiter.reserve()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            if open_body is not None:
+                kwargs["data"] = open_body()
+            try:
+                async with self._semaphore:
+                    response = await self._get_session().request(method, url, **kwargs)
+                    await response.read()
+            finally:
+                if open_body is not None:
+                    kwargs["data"].close()
+            if (
+                response.status not in RETRYABLE_STATUS_CODES
+                or attempt >= self._max_retries
+                or not retryable
+            ):
+                return response
+            delay = parse_retry_after(response.headers.get("Retry-After"))
+            if delay is None:
+                delay = self._retry_backoff.get_delay(attempt)
+            attempt += 1
+            self._logger.warning(
+                f"Request throttled with status {response.status}, retry {attempt}/{self._max_retries} in {delay:.2f} seconds."
+            )
+            await asyncio.sleep(delay)
+
+    def _get_analyzer_url(self, endpoint, api_version, analyzer_id):
+        return f"{endpoint}/contentunderstanding/analyzers/{analyzer_id}?api-version={api_version}"  # noqa
+
+    def _get_analyzer_list_url(self, endpoint, api_version):
+        return f"{endpoint}/contentunderstanding/analyzers?api-version={api_version}"
+
+    def _get_analyze_url(self, endpoint, api_version, analyzer_id):
+        return f"{endpoint}/contentunderstanding/analyzers/{analyzer_id}:analyze?api-version={api_version}"  # noqa
+
+    def _get_training_data_config(
+        self, storage_container_sas_url, storage_container_path_prefix
+    ):
+        return {
+            "containerUrl": storage_container_sas_url,
+            "kind": "blob",
+            "prefix": storage_container_path_prefix,
+        }
+
+    def _get_headers(self, subscription_key, x_ms_useragent):
+        """Returns the headers for the HTTP requests that do not change over the life of the client.
+        Args:
+            subscription_key (str): The subscription key for the service.
+            x_ms_useragent (str): The user agent reported to the service.
+        Returns:
+            dict: A dictionary containing the headers for the HTTP requests.
+        """
+        headers = {"Ocp-Apim-Subscription-Key": subscription_key} if subscription_key else {}
+        headers["x-ms-useragent"] = x_ms_useragent
+        return headers
+
+    @property
+    def _headers(self):
+        """The headers for the next HTTP request, with the current cached bearer token."""
+        if self._token_cache is None:
+            return self._static_headers
+        headers = dict(self._static_headers)
+        headers["Authorization"] = f"Bearer {self._token_cache.get_token()}"
+        return headers
+
+    async def get_all_analyzers(self):
+        """
+        Retrieves a list of all available analyzers from the content understanding service.
+
+        Every page of the listing is fetched, following `nextLink`.
+
+        Returns:
+            dict: A dictionary whose "value" holds the list of available analyzers.
+
+        Raises:
+            aiohttp.ClientResponseError: If the HTTP request returned an unsuccessful status code.
+        """
+        return {"value": [analyzer async for analyzer in self.iter_analyzers()]}
+
+    async def iter_analyzers(self):
+        """
+        Yields the analyzers of the resource, fetching the pages of the listing lazily.
+
+        Yields:
+            dict: The definition of an analyzer.
+
+        Raises:
+            aiohttp.ClientResponseError: If the HTTP request returned an unsuccessful status code.
+        """
+        url = self._get_analyzer_list_url(self._endpoint, self._api_version)
+        while url:
+            response = await self._send_request("GET", url=url, headers=self._headers)
+            response.raise_for_status()
+            page = await response.json()
+            for analyzer in page.get("value", []):
+                yield analyzer
+            url = page.get("nextLink")
+
+    async def get_analyzer_detail_by_id(self, analyzer_id):
+        """
+        Retrieves a specific analyzer detail through analyzerid from the content understanding service.
+
+        Args:
+            analyzer_id (str): The unique identifier for the analyzer.
+
+        Returns:
+            dict: A dictionary containing the JSON response from the service, which includes the target analyzer detail.
+
+        Raises:
+            aiohttp.ClientResponseError: If the request fails.
+        """
+        response = await self._send_request(
+            "GET",
+            url=self._get_analyzer_url(self._endpoint, self._api_version, analyzer_id),
+            headers=self._headers,
+        )
+        response.raise_for_status()
+        return await response.json()
+
+    async def begin_create_analyzer(
+        self,
+        analyzer_id: str,
+        analyzer_template: dict = None,
+        analyzer_template_path: str = "",
+        training_storage_container_sas_url: str = "",
+        training_storage_container_path_prefix: str = "",
+    ):
+        """
+        Initiates the creation of an analyzer with the given ID and schema.
+
+        Args:
+            analyzer_id (str): The unique identifier for the analyzer.
+            analyzer_template (dict, optional): The schema definition for the analyzer. Defaults to None.
+            analyzer_template_path (str, optional): The file path to the analyzer schema JSON file. Defaults to "".
+            training_storage_container_sas_url (str, optional): The SAS URL for the training storage container. Defaults to "".
+            training_storage_container_path_prefix (str, optional): The path prefix within the training storage container. Defaults to "".
+
+        Raises:
+            ValueError: If neither `analyzer_template` nor `analyzer_template_path` is provided.
+            aiohttp.ClientResponseError: If the HTTP request to create the analyzer fails.
+
+        Returns:
+            aiohttp.ClientResponse: The response object from the HTTP request.
+        """
+        if analyzer_template_path and Path(analyzer_template_path).exists():
+            with open(analyzer_template_path, "r") as file:
+                analyzer_template = json.load(file)
+
+        if not analyzer_template:
+            raise ValueError("Analyzer schema must be provided.")
+
+        if (
+            training_storage_container_sas_url
+            and training_storage_container_path_prefix
+        ):  # noqa
+            analyzer_template["trainingData"] = self._get_training_data_config(
+                training_storage_container_sas_url,
+                training_storage_container_path_prefix,
+            )
+
+        headers = {"Content-Type": "application/json"}
+        headers.update(self._headers)
+
+        response = await self._send_request(
+            "PUT",
+            url=self._get_analyzer_url(self._endpoint, self._api_version, analyzer_id),
+            headers=headers,
+            json=analyzer_template,
+        )
+        response.raise_for_status()
+        self._logger.info(f"Analyzer {analyzer_id} create request accepted.")
+        return response
+
+    async def delete_analyzer(self, analyzer_id: str):
+        """
+        Deletes an analyzer with the specified analyzer ID.
+
+        Args:
+            analyzer_id (str): The ID of the analyzer to be deleted.
+
+        Returns:
+            aiohttp.ClientResponse: The response object from the delete request.
+
+        Raises:
+            aiohttp.ClientResponseError: If the delete request fails.
+        """
+        response = await self._send_request(
+            "DELETE",
+            url=self._get_analyzer_url(self._endpoint, self._api_version, analyzer_id),
+            headers=self._headers,
+        )
+        response.raise_for_status()
+        self._logger.info(f"Analyzer {analyzer_id} deleted.")
+        return response
+
+    async def begin_analyze(self, analyzer_id: str, file_location):
+        """
+        Begins the analysis of a file or URL using the specified analyzer.
+
+        Local files and streams are uploaded in chunks with a known Content-Length where
+        possible, and in-memory content is sent without being copied.
+
+        Args:
+            analyzer_id (str): The ID of the analyzer to use.
+            file_location (str | Path | BinaryIO | bytes | bytearray | memoryview): The path to the file or the URL
+                to analyze, a binary stream open for reading, or the content to analyze.
+
+        Returns:
+            aiohttp.ClientResponse: The response from the analysis request.
+
+        Raises:
+            ValueError: If the file location is not a valid path or URL.
+            aiohttp.ClientResponseError: If the HTTP request returned an unsuccessful status code.
+        """
+        url = self._get_analyze_url(self._endpoint, self._api_version, analyzer_id)
+        headers = {"Content-Type": "application/octet-stream"}
+        headers.update(self._headers)
+        if isinstance(file_location, BINARY_TYPES):
+            response = await self._send_request(
+                "POST", url=url, headers=headers, data=as_bytes_like(file_location)
+            )
+        elif is_stream(file_location):
+            response = await self._send_request("POST", url=url, headers=headers, data=file_location)
+        elif is_local_file(file_location):
+            response = await self._send_request(
+                "POST", url=url, headers=headers, open_body=lambda: open(file_location, "rb")
+            )
+        elif is_url(file_location):
+            headers["Content-Type"] = "application/json"
+            response = await self._send_request(
+                "POST", url=url, headers=headers, json={"url": file_location}
+            )
+        else:
+            raise ValueError("File location must be a valid path or URL.")
+
+        response.raise_for_status()
+        self._logger.info(
+            f"Analyzing file {describe_input(file_location)} with analyzer: {analyzer_id}"
+        )
+        return response
+
+    async def get_image_from_analyze_operation(
+        self, analyze_response: aiohttp.ClientResponse, image_id: str
+    ):
+        """Retrieves an image from the analyze operation using the image ID.
+        Args:
+            analyze_response (aiohttp.ClientResponse): The response object from the analyze operation.
+            image_id (str): The ID of the image to retrieve.
+        Returns:
+            bytes: The image content as a byte string.
+        """
+        operation_location = analyze_response.headers.get("operation-location", "")
+        if not operation_location:
+            raise ValueError(
+                "Operation location not found in the analyzer response header."
+            )
+        operation_location = operation_location.split("?api-version")[0]
+        image_retrieval_url = (
+            f"{operation_location}/images/{image_id}?api-version={self._api_version}"
+        )
+        try:
+            response = await self._send_request(
+                "GET", url=image_retrieval_url, headers=self._headers
+            )
+            response.raise_for_status()
+
+            assert response.headers.get("Content-Type") == "image/jpeg"
+
+            return await response.read()
+        except aiohttp.ClientError as e:
+            print(f"HTTP request failed: {e}")
+            return None
+
+    async def poll_result(
+        self,
+        response: aiohttp.ClientResponse,
+        timeout_seconds: int = 120,
+        polling_interval_seconds: float = None,
+        polling_strategy=None,
+        result_format: str = "json",
+    ):
+        """
+        Polls the result of an asynchronous operation until it completes or times out.
+
+        The wait between polls yields to the event loop, so many operations can be polled
+        concurrently from a single thread. It follows the `Retry-After` header when the
+        service sends one, and the polling strategy otherwise.
+
+        Args:
+            response (aiohttp.ClientResponse): The initial response object containing the operation location.
+            timeout_seconds (int, optional): The maximum number of seconds to wait for the operation to complete. Defaults to 120.
+            polling_interval_seconds (float, optional): A fixed number of seconds to wait between polling attempts.
+                Overrides `polling_strategy` when given. Defaults to None.
+            polling_strategy (PollingStrategy | str, optional): The strategy deciding the wait between polling attempts,
+                or a media type key of `POLLING_STRATEGIES` such as "video". Defaults to exponential backoff.
+            result_format (str, optional): "json" to return the decoded payload, "bytes" for the raw payload,
+                "lazy" for a `LazyAnalyzeResult` decoded on first access, or "model" for a compact typed
+                `AnalyzeResult`. Defaults to "json".
+
+        Raises:
+            ValueError: If the operation location is not found in the response headers.
+            TimeoutError: If the operation does not complete within the specified timeout.
+            RuntimeError: If the operation fails.
+
+        Returns:
+            dict | bytes | LazyAnalyzeResult | AnalyzeResult: The result of the completed operation if it succeeds.
+        """
+        operation_location = response.headers.get("operation-location", "")
+        if not operation_location:
+            raise ValueError("Operation location not found in response headers.")
+        polling_strategy = get_polling_strategy(polling_strategy, polling_interval_seconds)
+
+        start_time = time.time()
+        attempt = 0
+        while True:
+            elapsed_time = time.time() - start_time
+            if elapsed_time > timeout_seconds:
+                raise TimeoutError(
+                    f"Operation timed out after {timeout_seconds:.2f} seconds."
+                )
+
+            response = await self._send_request(
+                "GET", operation_location, headers=self._headers
+            )
+            response.raise_for_status()
+            attempt += 1
+            body = await response.read()
+            status, result = decode_operation_result(body, result_format)
+            if status == "succeeded":
+                self._logger.info(
+                    f"Request result is ready after {elapsed_time:.2f} seconds and {attempt} polls."
+                )
+                return result
+            elif status == "failed":
+                self._logger.error(f"Request failed. Reason: {body.decode('utf-8', 'replace')}")
+                raise RuntimeError("Request failed.")
+            else:
+                self._logger.info(
+                    f"Request {operation_location.split('/')[-1].split('?')[0]} in progress ..."
+                )
+            delay = get_poll_delay(polling_strategy, attempt - 1, response.headers)
+            remaining_time = timeout_seconds - (time.time() - start_time)
+            await asyncio.sleep(max(0.0, min(delay, remaining_time)))
+
+    async def analyze_many(
+        self,
+        analyzer_id: str,
+        file_locations,
+        max_in_flight: int = 64,
+        timeout_seconds: int = 120,
+        polling_interval_seconds: float = None,
+        polling_strategy=None,
+        result_format: str = "json",
+    ):
+        """
+        Analyzes many files or URLs with a bounded number of operations in flight.
+
+        Inputs are pulled from `file_locations` lazily, only when a slot in the in-flight
+        window frees up, so arbitrarily long manifests are never materialized. Results are
+        yielded in completion order, not input order.
+
+        Args:
+            analyzer_id (str): The ID of the analyzer to use.
+            file_locations (Iterable[str]): The paths to the files or the URLs to analyze.
+            max_in_flight (int, optional): The maximum number of operations submitted and not yet completed. Defaults to 64.
+            timeout_seconds (int, optional): The maximum number of seconds to wait for each operation. Defaults to 120.
+            polling_interval_seconds (float, optional): A fixed number of seconds to wait between polling attempts. Defaults to None.
+            polling_strategy (PollingStrategy | str, optional): The polling strategy for every operation. Defaults to
+                the strategy of the media type guessed from each file extension.
+            result_format (str, optional): "json", "bytes", "lazy" or "model", see `poll_result`. Defaults to "json".
+
+        Yields:
+            tuple: `(file_location, result)` where `result` is the result of the completed
+                operation, or the exception raised while submitting or polling it.
+        """
+        if max_in_flight < 1:
+            raise ValueError("Max in flight must be at least 1.")
+
+        async def analyze(file_location):
+            response = await self.begin_analyze(analyzer_id, file_location)
+            return await self.poll_result(
+                response,
+                timeout_seconds=timeout_seconds,
+                polling_interval_seconds=polling_interval_seconds,
+                polling_strategy=polling_strategy or get_media_type(file_location),
+                result_format=result_format,
+            )
+
+        file_locations = iter(file_locations)
+        pending = {}
+        try:
+            for file_location in itertools.islice(file_locations, max_in_flight):
+                pending[asyncio.ensure_future(analyze(file_location))] = file_location
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    file_location = pending.pop(task)
+                    for next_location in itertools.islice(file_locations, 1):
+                        pending[asyncio.ensure_future(analyze(next_location))] = next_location
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        self._logger.error(f"Analyzing {describe_input(file_location)} failed: {e}")
+                        result = e
+                    yield file_location, result
+        finally:
+            for task in pending:
+                task.cancel()
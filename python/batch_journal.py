@@ -0,0 +1,172 @@
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from pathlib import Path
+
+from .analyze_inputs import describe_input, get_content_digest, is_url
+
+# An entry is "running" from the moment the service accepted the operation until its final
+# result is stored, so a batch restarted after a crash polls it again instead of resubmitting.
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+JournalEntry = namedtuple(
+    "JournalEntry",
+    ("key", "analyzer_id", "input", "operation_location", "status", "result_path", "error", "updated_at"),
+)
+
+
+def get_journal_input_identity(file_location, content_digest: str = None) -> str:
+    """Returns an identity of an analyze input that is stable across processes.
+
+    Args:
+        file_location (str | Path | BinaryIO | bytes | bytearray | memoryview): The input of the analyze call.
+        content_digest (str, optional): The content digest of the input if already computed.
+    Returns:
+        str: The content digest of local inputs, the URL of remote ones, or None for streams that
+            cannot be rewound.
+    """
+    digest = content_digest or get_content_digest(file_location)
+    if digest is None and is_url(file_location):
+        return file_location
+    return digest
+
+
+class BatchJournal:
+    """Durably records the operations of a batch in a SQLite database.
+
+    Each input is recorded with its analyzer, the operation location returned when it was
+    submitted, its status and the path of its final result. A batch restarted on the same
+    journal re-attaches to the operations still running and skips the completed inputs, so
+    recovering from a crash costs only the work that was not finished.
+    """
+
+    def __init__(self, path, result_directory=None):
+        """
+        Args:
+            path (str | Path): The path of the SQLite database, created if missing.
+            result_directory (str | Path, optional): The directory final results are written to.
+                Defaults to a "<database name>.results" directory next to the database.
+        """
+        self.path = str(path)
+        self.result_directory = Path(result_directory or f"{self.path}.results")
+        self.result_directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS operations ("
+                "key TEXT PRIMARY KEY, analyzer_id TEXT NOT NULL, input TEXT NOT NULL, "
+                "operation_location TEXT, status TEXT NOT NULL, result_path TEXT, error TEXT, "
+                "updated_at REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS operations_status ON operations (status)"
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def get_key(self, analyzer_id: str, file_location, content_digest: str = None) -> str:
+        """Returns the journal key of an input analyzed by an analyzer.
+
+        Args:
+            analyzer_id (str): The ID of the analyzer.
+            file_location (str | Path | BinaryIO | bytes | bytearray | memoryview): The input of the analyze call.
+            content_digest (str, optional): The content digest of the input if already computed.
+
+        Returns:
+            str: A hex SHA-256 digest, or None if the input cannot be identified across processes.
+        """
+        input_identity = get_journal_input_identity(file_location, content_digest)
+        if input_identity is None:
+            return None
+        return hashlib.sha256(f"{analyzer_id}\n{input_identity}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> JournalEntry:
+        """Returns the entry recorded for the key, or None."""
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT {', '.join(JournalEntry._fields)} FROM operations WHERE key = ?", (key,)
+            ).fetchone()
+        return JournalEntry(*row) if row else None
+
+    def get_entries(self, status: str = None) -> list:
+        """Returns the recorded entries, optionally only those with the given status."""
+        query = f"SELECT {', '.join(JournalEntry._fields)} FROM operations"
+        parameters = ()
+        if status is not None:
+            query += " WHERE status = ?"
+            parameters = (status,)
+        with self._lock:
+            rows = self._connection.execute(query + " ORDER BY updated_at", parameters).fetchall()
+        return [JournalEntry(*row) for row in rows]
+
+    def counts(self) -> dict:
+        """Returns the number of entries per status."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT status, COUNT(*) FROM operations GROUP BY status"
+            ).fetchall()
+        return dict(rows)
+
+    def record_submitted(self, key: str, analyzer_id: str, file_location, operation_location: str):
+        """Records that the service accepted the operation analyzing an input."""
+        self._write(
+            "INSERT OR REPLACE INTO operations "
+            "(key, analyzer_id, input, operation_location, status, result_path, error, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, NULL, NULL, ?)",
+            (key, analyzer_id, describe_input(file_location), operation_location, RUNNING, time.time()),
+        )
+
+    def record_succeeded(self, key: str, result: bytes) -> Path:
+        """Writes the raw final result of an operation and marks its input as completed.
+
+        Returns:
+            Path: The path of the result file.
+        """
+        result_path = self.result_directory / f"{key}.json"
+        fd, temp_path = tempfile.mkstemp(dir=self.result_directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(result)
+            os.replace(temp_path, result_path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+        self._write(
+            "UPDATE operations SET status = ?, result_path = ?, error = NULL, updated_at = ? WHERE key = ?",
+            (SUCCEEDED, str(result_path), time.time(), key),
+        )
+        return result_path
+
+    def record_failed(self, key: str, error):
+        """Marks the operation of an input as failed, so the next run submits the input again."""
+        self._write(
+            "UPDATE operations SET status = ?, error = ?, updated_at = ? WHERE key = ?",
+            (FAILED, str(error), time.time(), key),
+        )
+
+    def load_result(self, entry: JournalEntry) -> bytes:
+        """Returns the raw final result of a completed entry, or None if its file is missing."""
+        try:
+            return Path(entry.result_path).read_bytes()
+        except (FileNotFoundError, TypeError):
+            return None
+
+    def _write(self, statement, parameters):
+        with self._lock, self._connection:
+            self._connection.execute(statement, parameters)
@@ -1,10 +1,54 @@
 import requests
+from requests.adapters import HTTPAdapter
 from requests.models import Response
 import logging
+import itertools
 import json
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from http.cookiejar import DefaultCookiePolicy
+import tempfile
+import threading
 import time
+from collections import OrderedDict
 from pathlib import Path
 
+from .analyzer_registry import AnalyzerRegistry
+from .analyze_inputs import (
+    BINARY_TYPES,
+    as_bytes_like,
+    describe_input,
+    get_content_digest,
+    is_local_file,
+    is_stream,
+    is_url,
+)
+from .batch_journal import RUNNING, SUCCEEDED
+from .instrumentation import Instrumentation, OperationEvent, RequestEvent, classify_request
+from .poll_scheduler import PollScheduler
+from .polling import (
+    ExponentialBackoffPolling,
+    get_media_type,
+    get_poll_delay,
+    get_polling_strategy,
+    parse_retry_after,
+)
+from .result_cache import get_cache_key
+from .result_stream import ChunkReader, iter_result_events, read_status, tee_chunks
+from .results import decode_operation_result, sniff_status
+from .segmenting import merge_segment_results, split_media, split_pdf
+from .single_flight import SingleFlight
+from .throttling import AdaptiveConcurrencyLimiter, RETRYABLE_STATUS_CODES, TokenBucketRateLimiter
+from .token_cache import TokenCache
+
+_EXHAUSTED = object()
+
+# Bytes of a streamed result held in memory while looking for a status that is not near its
+# start; more are spooled to a temporary file.
+_STREAM_SPOOL_BYTES = 1 << 20
+
+# Submit times remembered for operations begun by `begin_analyze` and not polled yet.
+_MAX_SUBMIT_TIMES = 10000
+
 
 class AzureContentUnderstandingClient:
     def __init__(
@@ -14,7 +58,55 @@ class AzureContentUnderstandingClient:
         subscription_key: str = None,
         token_provider: callable = None,
         x_ms_useragent: str = "cu-sample-code",
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        connect_timeout_seconds: float = 10,
+        read_timeout_seconds: float = 60,
+        poll_workers: int = 1,
+        result_cache=None,
+        token_refresh_margin_seconds: float = 300,
+        max_retries: int = 3,
+        rate_limiter: TokenBucketRateLimiter = None,
+        concurrency_limiter: AdaptiveConcurrencyLimiter = None,
+        single_flight: bool = False,
+        instrumentation: Instrumentation = None,
+        analyzer_cache_ttl_seconds: float = 300,
     ):
+        """
+        Args:
+            endpoint (str): The endpoint of the content understanding service.
+            api_version (str): The API version to use.
+            subscription_key (str, optional): The subscription key for the service.
+            token_provider (callable, optional): A callable returning a bearer token for the service.
+            x_ms_useragent (str, optional): The user agent reported to the service for sample usage telemetry.
+            pool_connections (int, optional): The number of per-host connection pools to cache. Defaults to 10.
+            pool_maxsize (int, optional): The maximum number of connections kept alive per host. Defaults to 10.
+            pool_block (bool, optional): Whether to block when a host pool has no free connection instead of
+                opening an extra one that is discarded afterwards. Defaults to False.
+            keep_alive (bool, optional): Whether to reuse connections across requests. Defaults to True.
+            connect_timeout_seconds (float, optional): The timeout for establishing a connection. Defaults to 10.
+            read_timeout_seconds (float, optional): The timeout between bytes received from the service. Defaults to 60.
+            poll_workers (int, optional): The number of threads polling the operations registered
+                with `schedule_poll`. Defaults to 1.
+            result_cache (ResultCache, optional): A store of final results keyed by input content and analyzer
+                definition, consulted by `analyze` and `analyze_many` before calling the service. Defaults to None.
+            token_refresh_margin_seconds (float, optional): How long before expiry the token from `token_provider`
+                is refreshed, without blocking requests. Defaults to 300.
+            max_retries (int, optional): The number of times a throttled (429/503) request is retried. Defaults to 3.
+            rate_limiter (TokenBucketRateLimiter, optional): Limits the rate of all requests of the client, and of
+                any other client sharing it. Defaults to None.
+            concurrency_limiter (AdaptiveConcurrencyLimiter, optional): Bounds the requests in flight, shrinking the
+                bound when the service throttles and growing it back on success. `analyze_many` also caps its
+                window of operations to it. Defaults to None.
+            single_flight (bool, optional): Whether concurrent `analyze` calls for the same content or URL with
+                the same analyzer share one service operation. Local inputs are hashed to be compared. Defaults to False.
+            instrumentation (Instrumentation, optional): Collects latency, poll and size histograms of every HTTP call
+                and operation, and forwards them to its hooks. Defaults to None.
+            analyzer_cache_ttl_seconds (float, optional): How long the `analyzer_registry` serves a cached analyzer
+                definition before revalidating it with its ETag. Defaults to 300.
+        """
         if not subscription_key and not token_provider:
             raise ValueError(
                 "Either subscription key or token provider must be provided."
@@ -27,9 +119,182 @@ class AzureContentUnderstandingClient:
         self._endpoint = endpoint.rstrip("/")
         self._api_version = api_version
         self._logger = logging.getLogger(__name__)
-        self._headers = self._get_headers(
-            subscription_key, token_provider(), x_ms_useragent
+        self._static_headers = self._get_headers(subscription_key, x_ms_useragent)
+        self._token_cache = (
+            None
+            if subscription_key
+            else TokenCache(token_provider, refresh_margin_seconds=token_refresh_margin_seconds)
         )
+        if not keep_alive:
+            self._static_headers["Connection"] = "close"
+        self._timeout = (connect_timeout_seconds, read_timeout_seconds)
+        self._session = self._create_session(pool_connections, pool_maxsize, pool_block)
+        self._poll_workers = poll_workers
+        self._poll_scheduler = None
+        self._poll_scheduler_lock = threading.Lock()
+        self._result_cache = result_cache
+        self._max_retries = max_retries
+        self._retry_backoff = ExponentialBackoffPolling(initial_seconds=1, max_seconds=60)
+        self._rate_limiter = rate_limiter
+        self._concurrency_limiter = concurrency_limiter
+        self.analyzer_registry = AnalyzerRegistry(self, ttl_seconds=analyzer_cache_ttl_seconds)
+        self._single_flight = SingleFlight() if single_flight else None
+        self._instrumentation = instrumentation
+        self._submit_times = OrderedDict()
+        self._submit_times_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Stops the poll scheduler and token refresh and closes the pooled connections held by the client."""
+        with self._poll_scheduler_lock:
+            if self._poll_scheduler is not None:
+                self._poll_scheduler.close()
+                self._poll_scheduler = None
+        if self._token_cache is not None:
+            self._token_cache.close()
+        self._session.close()
+
+    def _create_session(self, pool_connections, pool_maxsize, pool_block):
+        """Creates the HTTP session shared by every call made by the client.
+
+        The underlying urllib3 connection pools are thread-safe, so a single session
+        can be used concurrently from worker threads and keeps TCP/TLS connections
+        alive between submits, polls and image downloads. Cookies are not needed by
+        the service and are blocked so the session holds no per-request state.
+        """
+        session = requests.Session()
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _send_request(self, method, url, **kwargs):
+        """Sends an HTTP request through the pooled session of the client.
+
+        Responses with status 429 or 503 are retried up to `max_retries` times, waiting for the
+        `Retry-After` sent by the service or an exponential backoff. Request bodies read from
+        streams are rewound between attempts; bodies from streams that cannot be rewound are
+        sent once.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The URL of the request.
+            **kwargs: Additional arguments passed to `requests.Session.request`.
+
+        Returns:
+            Response: The response from the service.
+        """
+        kwargs.setdefault("timeout", self._timeout)
+        body = kwargs.get("data")
+        body_position = None
+        if is_stream(body):
+            if not (hasattr(body, "seekable") and body.seekable()):
+                return self._send_request_once(method, url, **kwargs)
+            body_position = body.tell()
+
+        attempt = 0
+        while True:
+            response = self._send_request_once(method, url, **kwargs)
+            if response.status_code not in RETRYABLE_STATUS_CODES or attempt >= self._max_retries:
+                return response
+            delay = parse_retry_after(response.headers.get("Retry-After"))
+            if delay is None:
+                delay = self._retry_backoff.get_delay(attempt)
+            attempt += 1
+            self._logger.warning(
+                f"Request throttled with status {response.status_code}, retry {attempt}/{self._max_retries} in {delay:.2f} seconds."
+            )
+            response.close()
+            time.sleep(delay)
+            if body_position is not None:
+                body.seek(body_position)
+
+    def _send_request_once(self, method, url, reserved=False, **kwargs):
+        """Sends one HTTP request once the rate and concurrency limiters of the client allow it.
+
+        Callers that already reserved a token of the rate limiter pass `reserved=True`.
+        """
+        if self._rate_limiter is not None and not reserved:
+            self._rate_limiter.acquire()
+        if self._concurrency_limiter is None:
+            return self._request(method, url, **kwargs)
+        self._concurrency_limiter.acquire()
+        throttled = None
+        try:
+            response = self._request(method, url, **kwargs)
+            throttled = response.status_code in RETRYABLE_STATUS_CODES
+            return response
+        finally:
+            self._concurrency_limiter.release(throttled)
+
+    def _request(self, method, url, **kwargs):
+        """Sends one HTTP request on the session, recording it when instrumentation is enabled."""
+        if self._instrumentation is None:
+            return self._session.request(method, url, **kwargs)
+        start_time = time.time()
+        start_counter = time.perf_counter()
+        response = None
+        error = None
+        try:
+            response = self._session.request(method, url, **kwargs)
+            return response
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            bytes_sent = bytes_received = 0
+            if response is not None:
+                bytes_sent = int(response.request.headers.get("Content-Length") or 0)
+                if kwargs.get("stream"):
+                    bytes_received = int(response.headers.get("Content-Length") or 0)
+                else:
+                    bytes_received = len(response.content)
+            self._instrumentation.record_request(
+                RequestEvent(
+                    classify_request(method, url),
+                    method,
+                    url,
+                    start_time,
+                    time.perf_counter() - start_counter,
+                    None if response is None else response.status_code,
+                    bytes_sent,
+                    bytes_received,
+                    error,
+                )
+            )
+
+    def _remember_submit_time(self, response, submitted_at):
+        """Remembers when `begin_analyze` submitted an operation, for its instrumented duration."""
+        operation_location = response.headers.get("operation-location")
+        if self._instrumentation is None or not operation_location:
+            return
+        with self._submit_times_lock:
+            self._submit_times[operation_location] = submitted_at
+            if len(self._submit_times) > _MAX_SUBMIT_TIMES:
+                self._submit_times.popitem(last=False)
+
+    def _get_submit_time(self, operation_location, submitted_at=None):
+        """Returns when an operation was submitted: `submitted_at` if given, else the time remembered
+        by `begin_analyze`, or None if unknown."""
+        with self._submit_times_lock:
+            remembered = self._submit_times.pop(operation_location, None)
+        return remembered if submitted_at is None else submitted_at
+
+    def _record_operation(self, operation_location, start_time, polls, status):
+        if self._instrumentation is not None:
+            self._instrumentation.record_operation(
+                OperationEvent(operation_location, start_time, time.time() - start_time, polls, status)
+            )
 
     def _get_analyzer_url(self, endpoint, api_version, analyzer_id):
         return f"{endpoint}/contentunderstanding/analyzers/{analyzer_id}?api-version={api_version}"  # noqa
@@ -49,43 +314,62 @@ class AzureContentUnderstandingClient:
             "prefix": storage_container_path_prefix,
         }
 
-    def _get_headers(self, subscription_key, api_token, x_ms_useragent):
-        """Returns the headers for the HTTP requests.
+    def _get_headers(self, subscription_key, x_ms_useragent):
+        """Returns the headers for the HTTP requests that do not change over the life of the client.
         Args:
             subscription_key (str): The subscription key for the service.
-            api_token (str): The API token for the service.
-            enable_face_identification (bool): A flag to enable face identification.
+            x_ms_useragent (str): The user agent reported to the service.
         Returns:
             dict: A dictionary containing the headers for the HTTP requests.
         """
-        headers = (
-            {"Ocp-Apim-Subscription-Key": subscription_key}
-            if subscription_key
-            else {"Authorization": f"Bearer {api_token}"}
-        )
+        headers = {"Ocp-Apim-Subscription-Key": subscription_key} if subscription_key else {}
         headers["x-ms-useragent"] = x_ms_useragent
         return headers
 
+    @property
+    def _headers(self):
+        """The headers for the next HTTP request, with the current cached bearer token."""
+        if self._token_cache is None:
+            return self._static_headers
+        headers = dict(self._static_headers)
+        headers["Authorization"] = f"Bearer {self._token_cache.get_token()}"
+        return headers
+
     def get_all_analyzers(self):
         """
         Retrieves a list of all available analyzers from the content understanding service.
 
-        This method sends a GET request to the service endpoint to fetch the list of analyzers.
-        It raises an HTTPError if the request fails.
+        Every page of the listing is fetched, following `nextLink`. Use `iter_analyzers` to
+        process analyzers while the next pages are fetched, or to stop early.
 
         Returns:
-            dict: A dictionary containing the JSON response from the service, which includes
-                  the list of available analyzers.
+            dict: A dictionary whose "value" holds the list of available analyzers.
 
         Raises:
             requests.exceptions.HTTPError: If the HTTP request returned an unsuccessful status code.
         """
-        response = requests.get(
-            url=self._get_analyzer_list_url(self._endpoint, self._api_version),
-            headers=self._headers,
-        )
-        response.raise_for_status()
-        return response.json()
+        return {"value": list(self.iter_analyzers())}
+
+    def iter_analyzers(self):
+        """
+        Yields the analyzers of the resource, fetching the pages of the listing lazily.
+
+        The next page is requested, through `nextLink`, only once the analyzers of the current
+        page have been consumed.
+
+        Yields:
+            dict: The definition of an analyzer.
+
+        Raises:
+            requests.exceptions.HTTPError: If the HTTP request returned an unsuccessful status code.
+        """
+        url = self._get_analyzer_list_url(self._endpoint, self._api_version)
+        while url:
+            response = self._send_request("GET", url=url, headers=self._headers)
+            response.raise_for_status()
+            page = response.json()
+            yield from page.get("value", [])
+            url = page.get("nextLink")
 
     def get_analyzer_detail_by_id(self, analyzer_id):
         """
@@ -101,13 +385,32 @@ class AzureContentUnderstandingClient:
         Raises:
             HTTPError: If the request fails.
         """
-        response = requests.get(
+        response = self._send_request(
+            "GET",
             url=self._get_analyzer_url(self._endpoint, self._api_version, analyzer_id),
             headers=self._headers,
         )
         response.raise_for_status()
         return response.json()
 
+    def _get_analyzer_response(self, analyzer_id, etag=None):
+        """Gets an analyzer definition, conditionally on its ETag when given.
+
+        Returns:
+            Response: The response, with status 200, 304 (not modified) or 404 (not found).
+        """
+        headers = self._headers
+        if etag:
+            headers = dict(headers, **{"If-None-Match": etag})
+        response = self._send_request(
+            "GET",
+            url=self._get_analyzer_url(self._endpoint, self._api_version, analyzer_id),
+            headers=headers,
+        )
+        if response.status_code not in (304, 404):
+            response.raise_for_status()
+        return response
+
     def begin_create_analyzer(
         self,
         analyzer_id: str,
@@ -152,12 +455,14 @@ class AzureContentUnderstandingClient:
         headers = {"Content-Type": "application/json"}
         headers.update(self._headers)
 
-        response = requests.put(
+        response = self._send_request(
+            "PUT",
             url=self._get_analyzer_url(self._endpoint, self._api_version, analyzer_id),
             headers=headers,
             json=analyzer_template,
         )
         response.raise_for_status()
+        self.analyzer_registry.invalidate(analyzer_id)
         self._logger.info(f"Analyzer {analyzer_id} create request accepted.")
         return response
 
@@ -174,21 +479,28 @@ class AzureContentUnderstandingClient:
         Raises:
             HTTPError: If the delete request fails.
         """
-        response = requests.delete(
+        response = self._send_request(
+            "DELETE",
             url=self._get_analyzer_url(self._endpoint, self._api_version, analyzer_id),
             headers=self._headers,
         )
         response.raise_for_status()
+        self.analyzer_registry.invalidate(analyzer_id)
         self._logger.info(f"Analyzer {analyzer_id} deleted.")
         return response
 
-    def begin_analyze(self, analyzer_id: str, file_location: str):
+    def begin_analyze(self, analyzer_id: str, file_location):
         """
         Begins the analysis of a file or URL using the specified analyzer.
 
+        Local files and streams are uploaded straight from disk in small blocks with a known
+        Content-Length, and in-memory content is sent without being copied, so memory use does
+        not grow with the size of the input.
+
         Args:
             analyzer_id (str): The ID of the analyzer to use.
-            file_location (str): The path to the file or the URL to analyze.
+            file_location (str | Path | BinaryIO | bytes | bytearray | memoryview): The path to the file or the URL
+                to analyze, a binary stream open for reading, or the content to analyze.
 
         Returns:
             Response: The response from the analysis request.
@@ -197,41 +509,44 @@ class AzureContentUnderstandingClient:
             ValueError: If the file location is not a valid path or URL.
             HTTPError: If the HTTP request returned an unsuccessful status code.
         """
-        data = None
-        if Path(file_location).exists():
-            with open(file_location, "rb") as file:
-                data = file.read()
-            headers = {"Content-Type": "application/octet-stream"}
-        elif "https://" in file_location or "http://" in file_location:
-            data = {"url": file_location}
-            headers = {"Content-Type": "application/json"}
-        else:
-            raise ValueError("File location must be a valid path or URL.")
-
+        url = self._get_analyze_url(self._endpoint, self._api_version, analyzer_id)
+        headers = {"Content-Type": "application/octet-stream"}
         headers.update(self._headers)
-        if isinstance(data, dict):
-            response = requests.post(
-                url=self._get_analyze_url(
-                    self._endpoint, self._api_version, analyzer_id
-                ),
-                headers=headers,
-                json=data,
+        submitted_at = time.time()
+        if isinstance(file_location, BINARY_TYPES):
+            response = self._send_request(
+                "POST", url=url, headers=headers, data=as_bytes_like(file_location)
             )
-        else:
-            response = requests.post(
-                url=self._get_analyze_url(
-                    self._endpoint, self._api_version, analyzer_id
-                ),
-                headers=headers,
-                data=data,
+        elif is_stream(file_location):
+            response = self._send_request("POST", url=url, headers=headers, data=file_location)
+        elif is_local_file(file_location):
+            with open(file_location, "rb") as file:
+                response = self._send_request("POST", url=url, headers=headers, data=file)
+        elif is_url(file_location):
+            headers["Content-Type"] = "application/json"
+            response = self._send_request(
+                "POST", url=url, headers=headers, json={"url": file_location}
             )
+        else:
+            raise ValueError("File location must be a valid path or URL.")
 
         response.raise_for_status()
+        # Operation durations are measured from the submission, see `poll_result`.
+        self._remember_submit_time(response, submitted_at)
         self._logger.info(
-            f"Analyzing file {file_location} with analyzer: {analyzer_id}"
+            f"Analyzing file {describe_input(file_location)} with analyzer: {analyzer_id}"
         )
         return response
 
+    def _get_image_url(self, analyze_response, image_id):
+        operation_location = analyze_response.headers.get("operation-location", "")
+        if not operation_location:
+            raise ValueError(
+                "Operation location not found in the analyzer response header."
+            )
+        operation_location = operation_location.split("?api-version")[0]
+        return f"{operation_location}/images/{image_id}?api-version={self._api_version}"
+
     def get_image_from_analyze_operation(
         self, analyze_response: Response, image_id: str
     ):
@@ -242,17 +557,11 @@ class AzureContentUnderstandingClient:
         Returns:
             bytes: The image content as a byte string.
         """
-        operation_location = analyze_response.headers.get("operation-location", "")
-        if not operation_location:
-            raise ValueError(
-                "Operation location not found in the analyzer response header."
-            )
-        operation_location = operation_location.split("?api-version")[0]
-        image_retrieval_url = (
-            f"{operation_location}/images/{image_id}?api-version={self._api_version}"
-        )
+        image_retrieval_url = self._get_image_url(analyze_response, image_id)
         try:
-            response = requests.get(url=image_retrieval_url, headers=self._headers)
+            response = self._send_request(
+                "GET", url=image_retrieval_url, headers=self._headers
+            )
             response.raise_for_status()
 
             assert response.headers.get("Content-Type") == "image/jpeg"
@@ -262,19 +571,194 @@ class AzureContentUnderstandingClient:
             print(f"HTTP request failed: {e}")
             return None
 
+    def download_images(
+        self,
+        analyze_response: Response,
+        image_ids,
+        output_dir: str = None,
+        callback: callable = None,
+        max_workers: int = 8,
+        chunk_size: int = 64 * 1024,
+    ):
+        """
+        Downloads many images of an analyze operation concurrently, such as the keyframes of a video.
+
+        Duplicate image IDs are downloaded once. Each image is streamed in chunks straight to
+        `output_dir` or to `callback`, so images are never held in memory whole.
+
+        Args:
+            analyze_response (Response): The response object from the analyze operation.
+            image_ids (Iterable[str]): The IDs of the images to retrieve, see `get_image_ids`.
+            output_dir (str, optional): The directory the images are written to as `<image_id>.jpg`.
+            callback (callable, optional): Called as `callback(image_id, chunks)` with an iterator over the
+                bytes of the image, instead of writing to `output_dir`. It runs on the download worker threads,
+                up to `max_workers` at a time, so it must be thread-safe when it touches shared state.
+            max_workers (int, optional): The maximum number of concurrent downloads. Defaults to 8.
+            chunk_size (int, optional): The number of bytes read at a time. Defaults to 64 KiB.
+
+        Raises:
+            ValueError: If neither or both of `output_dir` and `callback` are provided, or the operation
+                location is not found in the analyze response.
+
+        Returns:
+            dict: Maps each image ID to the path written (None when using `callback`), or to the exception
+                raised while downloading it.
+        """
+        if (output_dir is None) == (callback is None):
+            raise ValueError("Exactly one of output directory or callback must be provided.")
+        image_ids = list(dict.fromkeys(image_ids))
+        self._get_image_url(analyze_response, "")
+        if output_dir is not None:
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+        def download(image_id):
+            response = self._send_request(
+                "GET",
+                url=self._get_image_url(analyze_response, image_id),
+                headers=self._headers,
+                stream=True,
+            )
+            with response:
+                response.raise_for_status()
+                content_type = response.headers.get("Content-Type")
+                if content_type != "image/jpeg":
+                    raise ValueError(f"Unexpected content type {content_type} for image {image_id}.")
+                chunks = response.iter_content(chunk_size=chunk_size)
+                if callback is not None:
+                    callback(image_id, chunks)
+                    return None
+                path = Path(output_dir) / f"{image_id}.jpg"
+                temp_path = path.with_suffix(".jpg.tmp")
+                try:
+                    with open(temp_path, "wb") as file:
+                        for chunk in chunks:
+                            file.write(chunk)
+                    temp_path.replace(path)
+                except BaseException:
+                    # Leave no partial download behind for the failed image.
+                    temp_path.unlink(missing_ok=True)
+                    raise
+                return str(path)
+
+        outcomes = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(download, image_id): image_id for image_id in image_ids}
+            for future in as_completed(futures):
+                image_id = futures[future]
+                try:
+                    outcomes[image_id] = future.result()
+                except Exception as e:
+                    self._logger.error(f"Downloading image {image_id} failed: {e}")
+                    outcomes[image_id] = e
+        return outcomes
+
+    def _get_operation_location(self, response):
+        # An operation begun earlier, e.g. by a previous process, is polled from its location alone.
+        if isinstance(response, str):
+            return response
+        operation_location = response.headers.get("operation-location", "")
+        if not operation_location:
+            raise ValueError("Operation location not found in response headers.")
+        return operation_location
+
+    def _get_poll_outcome(self, response, operation_location, result_format="json"):
+        """Interprets one poll response of a long-running operation, decoding its payload at most once.
+
+        Args:
+            response (Response): The response of the poll request.
+            operation_location (str): The URL polled, used for logging.
+            result_format (str, optional): The format of the returned result, see `poll_result`. Defaults to "json".
+
+        Raises:
+            RuntimeError: If the operation failed.
+
+        Returns:
+            dict | bytes | LazyAnalyzeResult | AnalyzeResult: The result if the operation succeeded, None if it is still running.
+        """
+        status, result = decode_operation_result(response.content, result_format)
+        if status == "succeeded":
+            return result
+        elif status == "failed":
+            self._logger.error(f"Request failed. Reason: {response.text}")
+            raise RuntimeError("Request failed.")
+        self._logger.info(
+            f"Request {operation_location.split('/')[-1].split('?')[0]} in progress ..."
+        )
+        return None
+
+    def schedule_poll(
+        self,
+        response: Response,
+        timeout_seconds: int = 120,
+        polling_interval_seconds: float = None,
+        polling_strategy=None,
+        result_format: str = "json",
+        submitted_at: float = None,
+    ):
+        """
+        Registers an operation with the poll scheduler of the client instead of polling it on the calling thread.
+
+        All scheduled operations are polled by the `poll_workers` threads of the client, so waiting
+        on many operations does not need one thread per operation.
+
+        Args:
+            response (Response | str): The initial response object containing the operation location,
+                or the operation location of an operation begun earlier.
+            timeout_seconds (int, optional): The maximum number of seconds to wait for the operation to complete. Defaults to 120.
+            polling_interval_seconds (float, optional): A fixed number of seconds to wait between polling attempts. Defaults to None.
+            polling_strategy (PollingStrategy | str, optional): The strategy deciding the wait between polling attempts,
+                or a media type key of `POLLING_STRATEGIES`. Defaults to exponential backoff.
+            result_format (str, optional): "json", "bytes", "lazy" or "model", see `poll_result`. Defaults to "json".
+            submitted_at (float, optional): The time the operation was submitted, from which its duration is
+                recorded by the instrumentation. Defaults to the time `begin_analyze` submitted it if this client
+                did, or the time of the first poll.
+
+        Returns:
+            concurrent.futures.Future: A future resolved with the result of the completed operation,
+                or with the exception `poll_result` would have raised.
+        """
+        with self._poll_scheduler_lock:
+            if self._poll_scheduler is None:
+                self._poll_scheduler = PollScheduler(self, max_workers=self._poll_workers)
+        return self._poll_scheduler.register(
+            response,
+            timeout_seconds=timeout_seconds,
+            polling_interval_seconds=polling_interval_seconds,
+            polling_strategy=polling_strategy,
+            result_format=result_format,
+            submitted_at=self._get_submit_time(self._get_operation_location(response), submitted_at),
+        )
+
     def poll_result(
         self,
         response: Response,
         timeout_seconds: int = 120,
-        polling_interval_seconds: int = 2,
+        polling_interval_seconds: float = None,
+        polling_strategy=None,
+        result_format: str = "json",
+        submitted_at: float = None,
     ):
         """
         Polls the result of an asynchronous operation until it completes or times out.
 
+        The wait between polls follows the `Retry-After` header when the service sends one,
+        and the polling strategy otherwise.
+
         Args:
-            response (Response): The initial response object containing the operation location.
+            response (Response | str): The initial response object containing the operation location,
+                or the operation location of an operation begun earlier.
             timeout_seconds (int, optional): The maximum number of seconds to wait for the operation to complete. Defaults to 120.
-            polling_interval_seconds (int, optional): The number of seconds to wait between polling attempts. Defaults to 2.
+            polling_interval_seconds (float, optional): A fixed number of seconds to wait between polling attempts.
+                Overrides `polling_strategy` when given. Defaults to None.
+            polling_strategy (PollingStrategy | str, optional): The strategy deciding the wait between polling attempts,
+                or a media type key of `POLLING_STRATEGIES` such as "video". Defaults to exponential backoff.
+            result_format (str, optional): "json" to return the decoded payload, "bytes" for the raw payload,
+                "lazy" for a `LazyAnalyzeResult` decoded on first access, or "model" for a compact typed
+                `AnalyzeResult`. With "bytes" and "lazy", large results are not decoded to check the status.
+                Defaults to "json".
+            submitted_at (float, optional): The time the operation was submitted, from which its duration is
+                recorded by the instrumentation. Defaults to the time `begin_analyze` submitted it if this client
+                did, or the time of the first poll.
 
         Raises:
             ValueError: If the operation location is not found in the response headers.
@@ -282,36 +766,501 @@ class AzureContentUnderstandingClient:
             RuntimeError: If the operation fails.
 
         Returns:
-            dict: The JSON response of the completed operation if it succeeds.
+            dict | bytes | LazyAnalyzeResult | AnalyzeResult: The result of the completed operation if it succeeds.
         """
-        operation_location = response.headers.get("operation-location", "")
-        if not operation_location:
-            raise ValueError("Operation location not found in response headers.")
-
-        headers = {"Content-Type": "application/json"}
-        headers.update(self._headers)
+        operation_location = self._get_operation_location(response)
+        polling_strategy = get_polling_strategy(polling_strategy, polling_interval_seconds)
 
         start_time = time.time()
+        submitted_at = self._get_submit_time(operation_location, submitted_at) or start_time
+        attempt = 0
         while True:
             elapsed_time = time.time() - start_time
             if elapsed_time > timeout_seconds:
+                self._record_operation(operation_location, submitted_at, attempt, "timeout")
                 raise TimeoutError(
                     f"Operation timed out after {timeout_seconds:.2f} seconds."
                 )
 
-            response = requests.get(operation_location, headers=self._headers)
+            response = self._send_request(
+                "GET", operation_location, headers=self._headers
+            )
             response.raise_for_status()
-            status = response.json().get("status").lower()
-            if status == "succeeded":
+            attempt += 1
+            try:
+                result = self._get_poll_outcome(response, operation_location, result_format)
+            except RuntimeError:
+                self._record_operation(operation_location, submitted_at, attempt, "failed")
+                raise
+            if result is not None:
                 self._logger.info(
-                    f"Request result is ready after {elapsed_time:.2f} seconds."
+                    f"Request result is ready after {elapsed_time:.2f} seconds and {attempt} polls."
                 )
-                return response.json()
-            elif status == "failed":
-                self._logger.error(f"Request failed. Reason: {response.json()}")
-                raise RuntimeError("Request failed.")
+                self._record_operation(operation_location, submitted_at, attempt, "succeeded")
+                return result
+            delay = get_poll_delay(polling_strategy, attempt - 1, response.headers)
+            remaining_time = timeout_seconds - (time.time() - start_time)
+            time.sleep(max(0.0, min(delay, remaining_time)))
+
+    def stream_result(
+        self,
+        response: Response,
+        timeout_seconds: int = 120,
+        polling_interval_seconds: float = None,
+        polling_strategy=None,
+        chunk_size: int = 64 * 1024,
+        submitted_at: float = None,
+    ):
+        """
+        Polls an operation like `poll_result`, then parses its final result incrementally as it is received.
+
+        Poll responses are streamed and their status is sniffed from the first bytes, so the body of the
+        final result is never held in memory whole: each content (a document, or a segment of audio or
+        video) is yielded as soon as it has been read, while the rest is still being received. Requires
+        the optional `ijson` package.
+
+        Args:
+            response (Response | str): The initial response object containing the operation location,
+                or the operation location of an operation begun earlier.
+            timeout_seconds (int, optional): The maximum number of seconds to wait for the operation to complete. Defaults to 120.
+            polling_interval_seconds (float, optional): A fixed number of seconds to wait between polling attempts. Defaults to None.
+            polling_strategy (PollingStrategy | str, optional): The strategy deciding the wait between polling attempts,
+                or a media type key of `POLLING_STRATEGIES`. Defaults to exponential backoff.
+            chunk_size (int, optional): The number of bytes read from the connection at a time. Defaults to 64 KiB.
+            submitted_at (float, optional): The time the operation was submitted, from which its duration is
+                recorded by the instrumentation. Defaults to the time `begin_analyze` submitted it if this client
+                did, or the time of the first poll.
+
+        Raises:
+            ValueError: If the operation location is not found in the response headers.
+            TimeoutError: If the operation does not complete within the specified timeout.
+            RuntimeError: If the operation fails.
+
+        Yields:
+            ResultEvent: A "content" event per content, each followed by a "field" event per field of the content.
+        """
+        operation_location = self._get_operation_location(response)
+        polling_strategy = get_polling_strategy(polling_strategy, polling_interval_seconds)
+
+        start_time = time.time()
+        submitted_at = self._get_submit_time(operation_location, submitted_at) or start_time
+        attempt = 0
+        while True:
+            elapsed_time = time.time() - start_time
+            if elapsed_time > timeout_seconds:
+                self._record_operation(operation_location, submitted_at, attempt, "timeout")
+                raise TimeoutError(
+                    f"Operation timed out after {timeout_seconds:.2f} seconds."
+                )
+
+            response = self._send_request(
+                "GET", operation_location, headers=self._headers, stream=True
+            )
+            with response, tempfile.SpooledTemporaryFile(_STREAM_SPOOL_BYTES) as spool:
+                response.raise_for_status()
+                attempt += 1
+                chunks = response.iter_content(chunk_size)
+                prefix = b""
+                status = None
+                for chunk in chunks:
+                    prefix += chunk
+                    status = sniff_status(prefix)
+                    if status is not None or len(prefix) >= 4096:
+                        break
+                if status is None:
+                    # The status is not near the start: parse up to it, spooling the bytes read
+                    # so that the contents before it can still be streamed afterwards.
+                    spool.write(prefix)
+                    status = read_status(ChunkReader(prefix, tee_chunks(chunks, spool))) or ""
+                    spool.seek(0)
+                    prefix = b""
+                    chunks = itertools.chain(iter(lambda: spool.read(chunk_size), b""), chunks)
+                status = status.lower()
+                if status == "succeeded":
+                    self._logger.info(
+                        f"Request result is ready after {elapsed_time:.2f} seconds and {attempt} polls, streaming it."
+                    )
+                    self._record_operation(operation_location, submitted_at, attempt, "succeeded")
+                    yield from iter_result_events(ChunkReader(prefix, chunks))
+                    return
+                body = prefix + b"".join(chunks)
+                if status == "failed":
+                    self._logger.error(f"Request failed. Reason: {body.decode('utf-8', 'replace')}")
+                    self._record_operation(operation_location, submitted_at, attempt, "failed")
+                    raise RuntimeError("Request failed.")
+            self._logger.info(
+                f"Request {operation_location.split('/')[-1].split('?')[0]} in progress ..."
+            )
+            delay = get_poll_delay(polling_strategy, attempt - 1, response.headers)
+            remaining_time = timeout_seconds - (time.time() - start_time)
+            time.sleep(max(0.0, min(delay, remaining_time)))
+
+    def _get_analyzer_fingerprint(self, analyzer_id):
+        """Returns a digest of the analyzer definition, cached by the analyzer registry."""
+        fingerprint = self.analyzer_registry.get_fingerprint(analyzer_id)
+        if fingerprint is None:
+            raise ValueError(f"Analyzer {analyzer_id} does not exist.")
+        return fingerprint
+
+    def _get_input_identity(self, file_location, content_digest=None):
+        """Returns the content digest of a local input, or the URL and its ETag for a remote one.
+
+        Args:
+            content_digest (str, optional): The content digest of the input if already computed.
+
+        Returns:
+            str: The identity of the input, or None if it cannot be identified reliably.
+        """
+        digest = content_digest or get_content_digest(file_location)
+        if digest is not None or not is_url(file_location):
+            return digest
+        # The URL points at third-party storage: it is queried without the service credentials.
+        try:
+            response = self._session.head(
+                file_location, allow_redirects=True, timeout=self._timeout
+            )
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            self._logger.warning(f"Could not identify {file_location} for caching: {e}")
+            return None
+        validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+        return f"{file_location}\n{validator}" if validator else None
+
+    def _lookup_result_cache(self, analyzer_id, file_location, content_digest=None):
+        """Returns `(cache_key, cached_payload)`; the key is None when the result cannot be cached."""
+        if self._result_cache is None:
+            return None, None
+        input_identity = self._get_input_identity(file_location, content_digest)
+        if input_identity is None:
+            return None, None
+        cache_key = get_cache_key(
+            analyzer_id, self._get_analyzer_fingerprint(analyzer_id), input_identity
+        )
+        return cache_key, self._result_cache.get(cache_key)
+
+    def analyze(
+        self,
+        analyzer_id: str,
+        file_location,
+        timeout_seconds: int = 120,
+        polling_interval_seconds: float = None,
+        polling_strategy=None,
+        result_format: str = "json",
+    ):
+        """
+        Analyzes a file or URL and waits for the result, serving it from the result cache when possible.
+
+        With a `result_cache`, the input is identified by the SHA-256 of its content, or by its URL and
+        ETag, and combined with the analyzer ID and definition. A cached final result is returned without
+        calling the service; otherwise the operation runs and its final result is stored.
+
+        With `single_flight`, a call made while an identical one (same analyzer, same content or URL) is
+        in flight waits for that operation instead of starting another, and receives its own copy of the
+        result. The polling options of the first call apply to the shared operation.
+
+        Args:
+            analyzer_id (str): The ID of the analyzer to use.
+            file_location (str | Path | BinaryIO | bytes | bytearray | memoryview): The input to analyze, see `begin_analyze`.
+            timeout_seconds (int, optional): The maximum number of seconds to wait for the operation to complete. Defaults to 120.
+            polling_interval_seconds (float, optional): A fixed number of seconds to wait between polling attempts. Defaults to None.
+            polling_strategy (PollingStrategy | str, optional): The polling strategy. Defaults to the strategy of the
+                media type guessed from the file extension.
+            result_format (str, optional): "json", "bytes", "lazy" or "model", see `poll_result`. Defaults to "json".
+
+        Returns:
+            dict | bytes | LazyAnalyzeResult | AnalyzeResult: The result of the completed operation.
+        """
+        if self._single_flight is None:
+            raw_result = self._analyze_raw(
+                analyzer_id, file_location, None, timeout_seconds, polling_interval_seconds, polling_strategy
+            )
+            return decode_operation_result(raw_result, result_format)[1]
+        content_digest = get_content_digest(file_location)
+        input_identity = content_digest or (file_location if is_url(file_location) else None)
+
+        def run():
+            return self._analyze_raw(
+                analyzer_id, file_location, content_digest, timeout_seconds, polling_interval_seconds, polling_strategy
+            )
+
+        # The raw payload is shared and decoded per caller, so callers never share mutable results.
+        if input_identity is None:
+            raw_result = run()
+        else:
+            raw_result = self._single_flight.do((analyzer_id, input_identity), run)
+        return decode_operation_result(raw_result, result_format)[1]
+
+    def _analyze_raw(
+        self, analyzer_id, file_location, content_digest, timeout_seconds, polling_interval_seconds, polling_strategy
+    ):
+        """Returns the raw final payload of an analysis, from the result cache when possible."""
+        cache_key, cached = self._lookup_result_cache(analyzer_id, file_location, content_digest)
+        if cached is not None:
+            self._logger.info(f"Result of {describe_input(file_location)} served from cache.")
+            return cached
+        response = self.begin_analyze(analyzer_id, file_location)
+        result = self.poll_result(
+            response,
+            timeout_seconds=timeout_seconds,
+            polling_interval_seconds=polling_interval_seconds,
+            polling_strategy=polling_strategy or get_media_type(file_location),
+            result_format="bytes",
+        )
+        if cache_key:
+            self._result_cache.put(cache_key, result)
+        return result
+
+    def analyze_many(
+        self,
+        analyzer_id: str,
+        file_locations,
+        max_in_flight: int = 8,
+        timeout_seconds: int = 120,
+        polling_interval_seconds: float = None,
+        polling_strategy=None,
+        result_format: str = "json",
+        journal=None,
+    ):
+        """
+        Analyzes many files or URLs with a bounded number of operations in flight.
+
+        Inputs are pulled from `file_locations` lazily, only when a slot in the in-flight
+        window frees up, so arbitrarily long manifests are never materialized. Results are
+        yielded in completion order, not input order. Inputs found in the result cache of
+        the client are not submitted, and the window shrinks with the concurrency limiter
+        of the client when the service throttles.
+
+        With a `journal`, every accepted operation and final result is recorded durably. Running
+        the same batch again on the journal, e.g. after a crash, yields the completed inputs from
+        their stored results and polls the operations still running instead of resubmitting them.
+
+        Args:
+            analyzer_id (str): The ID of the analyzer to use.
+            file_locations (Iterable[str]): The paths to the files or the URLs to analyze.
+            max_in_flight (int, optional): The maximum number of operations submitted and not yet
+                completed. Keep it at or below `pool_maxsize` to reuse pooled connections. Defaults to 8.
+            timeout_seconds (int, optional): The maximum number of seconds to wait for each operation. Defaults to 120.
+            polling_interval_seconds (float, optional): A fixed number of seconds to wait between polling attempts. Defaults to None.
+            polling_strategy (PollingStrategy | str, optional): The polling strategy for every operation. Defaults to
+                the strategy of the media type guessed from each file extension.
+            result_format (str, optional): "json", "bytes", "lazy" or "model", see `poll_result`. Defaults to "json".
+            journal (BatchJournal, optional): The journal recording the batch. Streams that cannot be
+                rewound are not journaled. Defaults to None.
+
+        Yields:
+            tuple: `(file_location, result)` where `result` is the result of the completed
+                operation, or the exception raised while submitting or polling it.
+        """
+        if max_in_flight < 1:
+            raise ValueError("Max in flight must be at least 1.")
+
+        def submit(file_location):
+            # Returns the cache and journal keys, and either a stored result or the operation to poll.
+            # The content is hashed once, for both keys.
+            content_digest = None
+            if journal or self._result_cache is not None:
+                content_digest = get_content_digest(file_location)
+            journal_key = journal.get_key(analyzer_id, file_location, content_digest) if journal else None
+            if journal_key:
+                entry = journal.get(journal_key)
+                if entry is not None and entry.status == SUCCEEDED:
+                    stored = journal.load_result(entry)
+                    if stored is not None:
+                        return None, journal_key, stored, None
+                elif entry is not None and entry.status == RUNNING:
+                    self._logger.info(f"Re-attaching to the operation of {describe_input(file_location)}.")
+                    return None, journal_key, None, entry.operation_location
+            cache_key, cached = self._lookup_result_cache(analyzer_id, file_location, content_digest)
+            if cached is not None:
+                return cache_key, None, cached, None
+            response = self.begin_analyze(analyzer_id, file_location)
+            if journal_key:
+                journal.record_submitted(
+                    journal_key, analyzer_id, file_location, self._get_operation_location(response)
+                )
+            return cache_key, journal_key, None, response
+
+        def refill():
+            window = max_in_flight
+            if self._concurrency_limiter is not None:
+                window = min(window, self._concurrency_limiter.limit)
+            while len(pending) < window:
+                file_location = next(file_locations, _EXHAUSTED)
+                if file_location is _EXHAUSTED:
+                    return
+                pending[executor.submit(submit, file_location)] = (file_location, None, None, False)
+
+        file_locations = iter(file_locations)
+        executor = ThreadPoolExecutor(max_workers=max_in_flight)
+        # Maps each future to its input, its cache and journal keys and whether it is the poll stage.
+        # Submits run on the executor, polls on the shared poll scheduler, so no thread waits between polls.
+        pending = {}
+        try:
+            refill()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file_location, cache_key, journal_key, is_poll = pending.pop(future)
+                    try:
+                        if is_poll:
+                            result = future.result()
+                            if journal_key:
+                                journal.record_succeeded(journal_key, result)
+                            if cache_key:
+                                self._result_cache.put(cache_key, result)
+                            if cache_key or journal_key:
+                                result = decode_operation_result(result, result_format)[1]
+                        else:
+                            cache_key, journal_key, stored, response = future.result()
+                            if stored is not None:
+                                result = decode_operation_result(stored, result_format)[1]
+                            else:
+                                poll_future = self.schedule_poll(
+                                    response,
+                                    timeout_seconds=timeout_seconds,
+                                    polling_interval_seconds=polling_interval_seconds,
+                                    polling_strategy=polling_strategy or get_media_type(file_location),
+                                    result_format="bytes" if cache_key or journal_key else result_format,
+                                )
+                                pending[poll_future] = (file_location, cache_key, journal_key, True)
+                                continue
+                    except Exception as e:
+                        self._logger.error(f"Analyzing {describe_input(file_location)} failed: {e}")
+                        if journal_key:
+                            self._record_journal_failure(journal, journal_key, e)
+                        result = e
+                    refill()
+                    yield file_location, result
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            for future in pending:
+                future.cancel()
+
+    def analyze_segmented(
+        self,
+        analyzer_id: str,
+        file_location,
+        pages_per_segment: int = 50,
+        segment_seconds: float = 600,
+        max_in_flight: int = 8,
+        timeout_seconds: int = 600,
+        polling_interval_seconds: float = None,
+        polling_strategy=None,
+    ):
+        """
+        Analyzes a long recording or a large PDF as segments analyzed concurrently, and merges their results.
+
+        The input is split locally: audio and video into time windows with ffmpeg, PDFs into page ranges
+        with pypdf. Segments are analyzed with `analyze_many`, so wall time grows with the number of
+        segments per in-flight slot rather than with the length of the input. Span offsets, page numbers
+        and times of the merged result refer to the whole input, see `merge_segment_results`.
+
+        Args:
+            analyzer_id (str): The ID of the analyzer to use.
+            file_location (str | Path | BinaryIO | bytes): A local audio or video file, or a PDF given by its
+                path, a binary stream or its content.
+            pages_per_segment (int, optional): The maximum number of pages of each PDF segment. Defaults to 50.
+            segment_seconds (float, optional): The target duration of each audio or video segment. Defaults to 600.
+            max_in_flight (int, optional): The maximum number of segments analyzed at once. Defaults to 8.
+            timeout_seconds (int, optional): The maximum number of seconds to wait for each segment. Defaults to 600.
+            polling_interval_seconds (float, optional): A fixed number of seconds to wait between polling attempts. Defaults to None.
+            polling_strategy (PollingStrategy | str, optional): The polling strategy for every segment. Defaults to
+                the strategy of the media type of the input.
+
+        Raises:
+            ValueError: If a recording is not a local file.
+            ImportError: If a PDF is given and pypdf is not installed.
+            RuntimeError: If the analysis of a segment fails.
+            TimeoutError: If a segment does not complete within the timeout.
+
+        Returns:
+            dict: The merged result of the whole input.
+        """
+        media_type = get_media_type(file_location)
+        with tempfile.TemporaryDirectory(prefix="cu-segments-") as directory:
+            if media_type in ("audio", "video"):
+                segments = split_media(file_location, directory, segment_seconds)
             else:
-                self._logger.info(
-                    f"Request {operation_location.split('/')[-1].split('?')[0]} in progress ..."
+                segments = split_pdf(file_location, pages_per_segment)
+            self._logger.info(
+                f"Analyzing {describe_input(file_location)} as {len(segments)} segments."
+            )
+            # Segment contents are distinct objects, so their identity maps results back to segments.
+            indexes = {id(segment.content): i for i, segment in enumerate(segments)}
+            results = [None] * len(segments)
+            for content, result in self.analyze_many(
+                analyzer_id,
+                (segment.content for segment in segments),
+                max_in_flight=max_in_flight,
+                timeout_seconds=timeout_seconds,
+                polling_interval_seconds=polling_interval_seconds,
+                polling_strategy=polling_strategy or media_type,
+            ):
+                if isinstance(result, Exception):
+                    raise result
+                results[indexes[id(content)]] = result
+        return merge_segment_results(segments, results)
+
+    def resume_batch(
+        self,
+        journal,
+        timeout_seconds: int = 120,
+        polling_interval_seconds: float = None,
+        polling_strategy=None,
+        result_format: str = "json",
+    ):
+        """
+        Re-attaches to the operations a previous run left running in a journal and waits for them.
+
+        No input is read or submitted: the recorded operation locations are polled, so recovering
+        a crashed batch costs only its unfinished operations. Run `analyze_many` on the same journal
+        afterwards to process the inputs that were never submitted or whose operation failed.
+
+        Args:
+            journal (BatchJournal): The journal of the interrupted batch.
+            timeout_seconds (int, optional): The maximum number of seconds to wait for each operation. Defaults to 120.
+            polling_interval_seconds (float, optional): A fixed number of seconds to wait between polling attempts. Defaults to None.
+            polling_strategy (PollingStrategy | str, optional): The polling strategy for every operation. Defaults to
+                the strategy of the media type guessed from each recorded input.
+            result_format (str, optional): "json", "bytes", "lazy" or "model", see `poll_result`. Defaults to "json".
+
+        Yields:
+            tuple: `(input, result)` where `input` is the recorded description of the input and `result`
+                is the result of the completed operation, or the exception raised while polling it.
+        """
+        pending = {}
+        try:
+            for entry in journal.get_entries(RUNNING):
+                poll_future = self.schedule_poll(
+                    entry.operation_location,
+                    submitted_at=entry.updated_at,
+                    timeout_seconds=timeout_seconds,
+                    polling_interval_seconds=polling_interval_seconds,
+                    polling_strategy=polling_strategy or get_media_type(entry.input),
+                    result_format="bytes",
                 )
-            time.sleep(polling_interval_seconds)
+                pending[poll_future] = entry
+            self._logger.info(f"Re-attached to {len(pending)} running operations.")
+            for future in as_completed(pending):
+                entry = pending[future]
+                try:
+                    raw_result = future.result()
+                    journal.record_succeeded(entry.key, raw_result)
+                    result = decode_operation_result(raw_result, result_format)[1]
+                except Exception as e:
+                    self._logger.error(f"Analyzing {entry.input} failed: {e}")
+                    self._record_journal_failure(journal, entry.key, e)
+                    result = e
+                yield entry.input, result
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _record_journal_failure(self, journal, journal_key, error):
+        # Operations that may still be running are left as such, to be polled again on resume.
+        if isinstance(
+            error,
+            (TimeoutError, requests.exceptions.ConnectionError, requests.exceptions.Timeout),
+        ):
+            return
+        journal.record_failed(journal_key, error)
@@ -0,0 +1,494 @@
+"""Local stand-in for the Content Understanding REST API, for load and latency testing offline.
+
+Run it with `python -m python.cu_emulator --port 8000` from the root of the repository and point
+a client, the agent tool function or the frontend at `http://127.0.0.1:8000`.
+"""
+
+import argparse
+import base64
+import json
+import logging
+import math
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+# An 8x8 grey JPEG, served for every keyframe and face image.
+PLACEHOLDER_JPEG = base64.b64decode(
+    "/9j/4AAQSkZJRgABAQAAAQABAAD/2wBDAFA3PEY8MlBGQUZaVVBfeMiCeG5uePWvuZHI////////////////////"
+    "////////////////////////////////wAALCAAIAAgBAREA/8QAFAABAAAAAAAAAAAAAAAAAAAAAP/EABQQAQAA"
+    "AAAAAAAAAAAAAAAAAAD/2gAIAQEAAD8AP//Z"
+)
+
+_DEFAULT_RESULT = {
+    "analyzerId": None,
+    "apiVersion": "2024-12-01-preview",
+    "createdAt": None,
+    "warnings": [],
+    "contents": [
+        {
+            "kind": "document",
+            "markdown": "# Emulated result\n\n![keyframe](keyFrame.1000.jpg)\n",
+            "fields": {},
+            "startPageNumber": 1,
+            "endPageNumber": 1,
+        }
+    ],
+}
+
+
+# Prebuilt analyzers every resource has; any other "prebuilt-" ID is answered as well.
+PREBUILT_ANALYZER_IDS = (
+    "prebuilt-documentAnalyzer",
+    "prebuilt-imageAnalyzer",
+    "prebuilt-audioAnalyzer",
+    "prebuilt-videoAnalyzer",
+)
+
+
+def _get_prebuilt_analyzer(analyzer_id):
+    return {"analyzerId": analyzer_id, "description": "Prebuilt analyzer.", "status": "ready"}
+
+
+class LatencyDistribution:
+    """Draws the number of seconds an emulated step takes."""
+
+    def sample(self) -> float:
+        raise NotImplementedError
+
+
+class FixedLatency(LatencyDistribution):
+    def __init__(self, seconds: float = 0):
+        self.seconds = seconds
+
+    def sample(self) -> float:
+        return self.seconds
+
+
+class UniformLatency(LatencyDistribution):
+    def __init__(self, low_seconds: float, high_seconds: float):
+        self.low_seconds = low_seconds
+        self.high_seconds = high_seconds
+
+    def sample(self) -> float:
+        return random.uniform(self.low_seconds, self.high_seconds)
+
+
+class LogNormalLatency(LatencyDistribution):
+    """Long-tailed latency, as observed for network calls: most samples near the median, a few far above."""
+
+    def __init__(self, median_seconds: float, sigma: float = 0.5, max_seconds: float = None):
+        self.median_seconds = median_seconds
+        self.sigma = sigma
+        self.max_seconds = max_seconds
+
+    def sample(self) -> float:
+        seconds = random.lognormvariate(math.log(self.median_seconds), self.sigma)
+        return seconds if self.max_seconds is None else min(seconds, self.max_seconds)
+
+
+class ProcessingTimeModel:
+    """Models how long the service takes to analyze an input: a base time plus a time per megabyte.
+
+    URL inputs have no known size and only take the base time.
+    """
+
+    def __init__(self, base: LatencyDistribution = None, seconds_per_megabyte: float = 0):
+        self.base = base or FixedLatency(0.5)
+        self.seconds_per_megabyte = seconds_per_megabyte
+
+    def get_seconds(self, analyzer_id: str, content_length: int) -> float:
+        return self.base.sample() + self.seconds_per_megabyte * content_length / (1 << 20)
+
+
+class _Operation:
+    __slots__ = ("analyzer_id", "ready_at", "failed", "result")
+
+    def __init__(self, analyzer_id, ready_at, failed, result=None):
+        self.analyzer_id = analyzer_id
+        self.ready_at = ready_at
+        self.failed = failed
+        # The encoded "result" of the operation, when it is not the canned result of its analyzer.
+        self.result = result
+
+
+class ContentUnderstandingEmulator:
+    """Emulates the REST paths used by the clients: analyzer management, `:analyze`, polling of
+    operation locations and keyframe images. Request counters are served at `/emulator/stats`.
+
+    Analyze operations complete after the time drawn from `processing_time` and return a canned
+    result, by analyzer ID or a default one. Creating an analyzer starts an operation too, which
+    completes after `analyzer_creation_seconds` with the analyzer as its result. Analyzer listings
+    are paged by `analyzer_page_size`, and the prebuilt analyzers always exist. Every request can be delayed by `request_latency`,
+    throttled with 429 or failed with 500, and operations can be made to fail.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        results: dict = None,
+        default_result=None,
+        request_latency: LatencyDistribution = None,
+        processing_time: ProcessingTimeModel = None,
+        throttle_rate: float = 0,
+        retry_after_seconds: float = 1,
+        error_rate: float = 0,
+        operation_failure_rate: float = 0,
+        poll_retry_after_seconds: float = None,
+        max_operations: int = 100000,
+        analyzer_creation_seconds: float = 0,
+        analyzer_page_size: int = 50,
+    ):
+        """
+        Args:
+            host (str, optional): The address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): The port to listen on, 0 for any free port. Defaults to 0.
+            results (dict, optional): Canned results by analyzer ID: a result payload as returned by the
+                service, or the path of a JSON file holding one, such as those under `data/`. Defaults to None.
+            default_result (dict | str | Path, optional): The canned result of other analyzers. Defaults to a
+                one-page document.
+            request_latency (LatencyDistribution, optional): The delay added to every response. Defaults to none.
+            processing_time (ProcessingTimeModel, optional): How long analyze operations run. Defaults to 0.5 seconds.
+            throttle_rate (float, optional): The probability of answering a request with 429. Defaults to 0.
+            retry_after_seconds (float, optional): The Retry-After sent with 429 responses. Defaults to 1.
+            error_rate (float, optional): The probability of answering a request with 500. Defaults to 0.
+            operation_failure_rate (float, optional): The probability of an analyze operation ending as "Failed". Defaults to 0.
+            poll_retry_after_seconds (float, optional): The Retry-After sent with operations still running. Defaults to none.
+            max_operations (int, optional): The number of operations remembered; older ones answer 404. Defaults to 100000.
+            analyzer_creation_seconds (float, optional): How long analyzer creation operations run. Defaults to 0.
+            analyzer_page_size (int, optional): The number of analyzers per page of the listing. Defaults to 50.
+        """
+        self.request_latency = request_latency or FixedLatency(0)
+        self.processing_time = processing_time or ProcessingTimeModel()
+        self.throttle_rate = throttle_rate
+        self.retry_after_seconds = retry_after_seconds
+        self.error_rate = error_rate
+        self.operation_failure_rate = operation_failure_rate
+        self.poll_retry_after_seconds = poll_retry_after_seconds
+        self.max_operations = max_operations
+        self.analyzer_creation_seconds = analyzer_creation_seconds
+        self.analyzer_page_size = analyzer_page_size
+        self._logger = logging.getLogger(__name__)
+        self._results = {
+            analyzer_id: self._encode_result(result) for analyzer_id, result in (results or {}).items()
+        }
+        self._default_result = self._encode_result(default_result or _DEFAULT_RESULT)
+        self._analyzers = {analyzer_id: _get_prebuilt_analyzer(analyzer_id) for analyzer_id in PREBUILT_ANALYZER_IDS}
+        self._operations = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "throttled": 0, "errors": 0, "operations": 0}
+        self._server = ThreadingHTTPServer((host, port), _EmulatorRequestHandler)
+        self._server.daemon_threads = True
+        self._server.emulator = self
+        self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serves requests on a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="cu-emulator", daemon=True)
+        self._thread.start()
+        self._logger.info(f"Content Understanding emulator listening on {self.endpoint}")
+        return self
+
+    def serve_forever(self):
+        """Serves requests on the calling thread until interrupted."""
+        self._logger.info(f"Content Understanding emulator listening on {self.endpoint}")
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _encode_result(self, result):
+        """Returns the "result" object of a canned payload, encoded once so polls only concatenate bytes."""
+        if isinstance(result, (str, Path)):
+            result = json.loads(Path(result).read_text(encoding="utf-8"))
+        if "result" in result and "status" in result:
+            result = result["result"]
+        return json.dumps(result).encode("utf-8")
+
+    def create_operation(self, analyzer_id, content_length):
+        return self._add_operation(
+            _Operation(
+                analyzer_id,
+                time.time() + self.processing_time.get_seconds(analyzer_id, content_length),
+                random.random() < self.operation_failure_rate,
+            )
+        )
+
+    def create_analyzer(self, analyzer_id, analyzer):
+        """Stores an analyzer and returns it with the ID of the operation creating it."""
+        analyzer = dict(analyzer, analyzerId=analyzer_id, status="ready")
+        with self._lock:
+            self._analyzers[analyzer_id] = analyzer
+        return analyzer, self._add_operation(
+            _Operation(
+                analyzer_id,
+                time.time() + self.analyzer_creation_seconds,
+                False,
+                json.dumps(analyzer).encode("utf-8"),
+            )
+        )
+
+    def get_analyzer(self, analyzer_id):
+        with self._lock:
+            analyzer = self._analyzers.get(analyzer_id)
+        if analyzer is None and analyzer_id.startswith("prebuilt-"):
+            analyzer = _get_prebuilt_analyzer(analyzer_id)
+        return analyzer
+
+    def _add_operation(self, operation):
+        operation_id = str(uuid.uuid4())
+        with self._lock:
+            self._operations[operation_id] = operation
+            self.stats["operations"] += 1
+            while len(self._operations) > self.max_operations:
+                self._operations.popitem(last=False)
+        return operation_id
+
+    def get_operation(self, operation_id):
+        with self._lock:
+            return self._operations.get(operation_id)
+
+    def get_result_body(self, operation_id, operation) -> bytes:
+        result = operation.result
+        if result is None:
+            result = self._results.get(operation.analyzer_id, self._default_result)
+        return b'{"id":"%s","status":"Succeeded","result":%s}' % (operation_id.encode("ascii"), result)
+
+
+class _EmulatorRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Responses are written in one buffered write with Nagle disabled, so small responses are not
+    # delayed by the delayed-ACK interaction of the client and server TCP stacks.
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        self.server.emulator._logger.debug(format % args)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+    def _handle(self, method):
+        emulator = self.server.emulator
+        body = self._read_body()
+        url = urlsplit(self.path)
+        path = url.path
+        if path == "/emulator/stats":
+            with emulator._lock:
+                stats = dict(emulator.stats)
+            return self._send_json(200, stats)
+        delay = emulator.request_latency.sample()
+        if delay > 0:
+            time.sleep(delay)
+        with emulator._lock:
+            emulator.stats["requests"] += 1
+        if random.random() < emulator.throttle_rate:
+            with emulator._lock:
+                emulator.stats["throttled"] += 1
+            return self._send_json(
+                429,
+                {"error": {"code": "429", "message": "Rate limit is exceeded."}},
+                {"Retry-After": f"{emulator.retry_after_seconds:g}"},
+            )
+        if random.random() < emulator.error_rate:
+            with emulator._lock:
+                emulator.stats["errors"] += 1
+            return self._send_json(500, {"error": {"code": "InternalServerError", "message": "Injected failure."}})
+        prefix = "/contentunderstanding/"
+        if not path.startswith(prefix):
+            return self._send_json(404, {"error": {"code": "NotFound", "message": path}})
+        parts = path[len(prefix):].split("/")
+        if parts[0] == "analyzerResults" and len(parts) >= 2:
+            if method != "GET":
+                return self._send_json(405, {"error": {"code": "MethodNotAllowed"}})
+            if len(parts) == 4 and parts[2] == "images":
+                return self._send_image(parts[1])
+            return self._send_operation(parts[1])
+        if parts[0] == "analyzers":
+            return self._handle_analyzers(method, parts[1:], body, parse_qs(url.query))
+        return self._send_json(404, {"error": {"code": "NotFound", "message": path}})
+
+    def _handle_analyzers(self, method, parts, body, query):
+        emulator = self.server.emulator
+        host = self.headers.get("Host") or "{}:{}".format(*self.server.server_address[:2])
+        api_version = query.get("api-version", ["2024-12-01-preview"])[0]
+        if not parts or not parts[0]:
+            skip = int(query.get("skip", ["0"])[0])
+            with emulator._lock:
+                analyzers = list(emulator._analyzers.values())
+            page = {"value": analyzers[skip : skip + emulator.analyzer_page_size]}
+            if skip + emulator.analyzer_page_size < len(analyzers):
+                page["nextLink"] = (
+                    f"http://{host}/contentunderstanding/analyzers?api-version={api_version}"
+                    f"&skip={skip + emulator.analyzer_page_size}"
+                )
+            return self._send_json(200, page)
+        analyzer_id = parts[0]
+        if len(parts) == 3 and parts[1] == "operations":
+            if method != "GET":
+                return self._send_json(405, {"error": {"code": "MethodNotAllowed"}})
+            return self._send_operation(parts[2])
+        if method == "POST" and analyzer_id.endswith(":analyze"):
+            analyzer_id = analyzer_id[: -len(":analyze")]
+            operation_id = emulator.create_operation(analyzer_id, len(body))
+            return self._send_json(
+                202,
+                {"id": operation_id, "status": "Running"},
+                {
+                    "Operation-Location": f"http://{host}/contentunderstanding/analyzerResults/"
+                    f"{operation_id}?api-version={api_version}"
+                },
+            )
+        if method == "GET":
+            analyzer = emulator.get_analyzer(analyzer_id)
+        elif method == "PUT":
+            analyzer, operation_id = emulator.create_analyzer(analyzer_id, json.loads(body or b"{}"))
+            return self._send_json(
+                201,
+                analyzer,
+                {
+                    "Operation-Location": f"http://{host}/contentunderstanding/analyzers/{analyzer_id}/"
+                    f"operations/{operation_id}?api-version={api_version}"
+                },
+            )
+        elif method == "DELETE":
+            with emulator._lock:
+                emulator._analyzers.pop(analyzer_id, None)
+            return self._send_json(204, None)
+        else:
+            return self._send_json(405, {"error": {"code": "MethodNotAllowed"}})
+        if analyzer is None:
+            return self._send_json(404, {"error": {"code": "NotFound", "message": analyzer_id}})
+        return self._send_json(200, analyzer)
+
+    def _send_operation(self, operation_id):
+        emulator = self.server.emulator
+        operation = emulator.get_operation(operation_id)
+        if operation is None:
+            return self._send_json(404, {"error": {"code": "NotFound", "message": operation_id}})
+        if time.time() < operation.ready_at:
+            headers = {}
+            if emulator.poll_retry_after_seconds is not None:
+                headers["Retry-After"] = f"{emulator.poll_retry_after_seconds:g}"
+            return self._send_json(200, {"id": operation_id, "status": "Running"}, headers)
+        if operation.failed:
+            return self._send_json(
+                200,
+                {
+                    "id": operation_id,
+                    "status": "Failed",
+                    "error": {"code": "InternalServerError", "message": "Injected operation failure."},
+                },
+            )
+        self._send(200, emulator.get_result_body(operation_id, operation))
+
+    def _send_image(self, operation_id):
+        operation = self.server.emulator.get_operation(operation_id)
+        if operation is None or time.time() < operation.ready_at:
+            return self._send_json(404, {"error": {"code": "NotFound", "message": operation_id}})
+        self._send(200, PLACEHOLDER_JPEG, content_type="image/jpeg")
+
+    def _read_body(self):
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b";")[0].strip(), 16)
+                chunks.append(self.rfile.read(size + 2)[:size])
+                if size == 0:
+                    return b"".join(chunks)
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send_json(self, status_code, payload, headers=None):
+        body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self._send(status_code, body, headers)
+
+    def _send(self, status_code, body, headers=None, content_type="application/json"):
+        self.send_response(status_code)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if body:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.wfile.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local Content Understanding service emulator.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--result",
+        action="append",
+        default=[],
+        metavar="ANALYZER_ID=PATH",
+        help="Canned result of an analyzer, e.g. prebuilt-audioAnalyzer=data/cu_pretranscribed.json. Repeatable.",
+    )
+    parser.add_argument("--default-result", help="Path of the canned result of other analyzers.")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Median latency added to every request.")
+    parser.add_argument("--latency-sigma", type=float, default=0, help="Log-normal spread of the latency, 0 for fixed.")
+    parser.add_argument("--processing-seconds", type=float, default=0.5, help="Base processing time of an operation.")
+    parser.add_argument("--seconds-per-megabyte", type=float, default=0, help="Processing time per uploaded megabyte.")
+    parser.add_argument("--throttle-rate", type=float, default=0, help="Probability of a 429 response.")
+    parser.add_argument("--error-rate", type=float, default=0, help="Probability of a 500 response.")
+    parser.add_argument("--failure-rate", type=float, default=0, help="Probability of a failed operation.")
+    parser.add_argument("--analyzer-page-size", type=int, default=50, help="Analyzers per page of the listing.")
+    args = parser.parse_args(argv)
+
+    latency = FixedLatency(args.latency_ms / 1000)
+    if args.latency_ms and args.latency_sigma:
+        latency = LogNormalLatency(args.latency_ms / 1000, args.latency_sigma)
+    emulator = ContentUnderstandingEmulator(
+        host=args.host,
+        port=args.port,
+        results=dict(item.split("=", 1) for item in args.result),
+        default_result=args.default_result,
+        request_latency=latency,
+        processing_time=ProcessingTimeModel(
+            FixedLatency(args.processing_seconds), args.seconds_per_megabyte
+        ),
+        throttle_rate=args.throttle_rate,
+        error_rate=args.error_rate,
+        operation_failure_rate=args.failure_rate,
+        analyzer_page_size=args.analyzer_page_size,
+    )
+    logging.basicConfig(level=logging.INFO)
+    try:
+        emulator.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        emulator._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
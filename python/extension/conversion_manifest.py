@@ -0,0 +1,144 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+# A converted source file. `output_path` is None for a file found to hold no supported
+# transcription, so that it is skipped as well while unchanged.
+ManifestEntry = namedtuple(
+    "ManifestEntry",
+    ("source_path", "size", "mtime_ns", "content_hash", "processor_version", "output_path", "recorded_at_ns"),
+)
+
+# Fingerprint of the content of a source file, taken before it is converted.
+SourceFingerprint = namedtuple("SourceFingerprint", ("size", "mtime_ns", "content_hash"))
+
+# A file modified within this window of being recorded may share its size and modification time
+# with a different content, as file systems store coarse timestamps; its hash is checked instead.
+_RACY_WINDOW_NS = 2_000_000_000
+
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+def hash_file(path) -> str:
+    """Returns the hex SHA-256 digest of the content of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ConversionManifest:
+    """Index of converted transcription files in a SQLite database, to skip unchanged inputs.
+
+    Each source path maps to the size, modification time and content hash of the file when it
+    was converted, the version of the processors that converted it and the converted file. A
+    file whose size and modification time are unchanged is recognized with a stat call and one
+    indexed lookup; one whose modification time changed is hashed, so touching a file does not
+    force its conversion. The database is in WAL mode, so parallel runs can share it.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str | Path): The path of the SQLite database, created if missing.
+        """
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS conversions ("
+                "source_path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, "
+                "content_hash TEXT NOT NULL, processor_version TEXT NOT NULL, output_path TEXT, "
+                "recorded_at_ns INTEGER NOT NULL)"
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def get_fingerprint(self, source_path) -> SourceFingerprint:
+        """Returns the fingerprint of a source file, to pass to `record` once it is converted."""
+        stat = os.stat(source_path)
+        return SourceFingerprint(stat.st_size, stat.st_mtime_ns, hash_file(source_path))
+
+    def lookup(self, source_path, processor_version: str) -> ManifestEntry:
+        """Returns the entry of a source file if it was converted by this processor version and
+        neither the file nor its converted file changed since, or None.
+
+        Args:
+            source_path (str | Path): The source file.
+            processor_version (str): The version of the processors converting it now.
+        """
+        source_path = os.path.abspath(source_path)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT * FROM conversions WHERE source_path = ?", (source_path,)
+            ).fetchone()
+        if row is None:
+            return None
+        entry = ManifestEntry(*row)
+        stat = os.stat(source_path)
+        if entry.processor_version != processor_version or entry.size != stat.st_size:
+            return None
+        if entry.output_path is not None and not os.path.exists(entry.output_path):
+            return None
+        if entry.mtime_ns == stat.st_mtime_ns and stat.st_mtime_ns < entry.recorded_at_ns - _RACY_WINDOW_NS:
+            return entry
+        if hash_file(source_path) != entry.content_hash:
+            return None
+        # Same content: remember the new modification time to take the fast path next time.
+        entry = entry._replace(mtime_ns=stat.st_mtime_ns, recorded_at_ns=time.time_ns())
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE conversions SET mtime_ns = ?, recorded_at_ns = ? WHERE source_path = ?",
+                (entry.mtime_ns, entry.recorded_at_ns, source_path),
+            )
+        return entry
+
+    def record(self, source_path, fingerprint: SourceFingerprint, processor_version: str, output_path):
+        """Records the conversion of a source file.
+
+        Args:
+            source_path (str | Path): The source file.
+            fingerprint (SourceFingerprint): The fingerprint of the file taken before converting it.
+            processor_version (str): The version of the processors that converted it.
+            output_path (str | Path): The converted file, or None if the file held nothing to convert.
+        """
+        if output_path is not None:
+            output_path = os.path.abspath(output_path)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO conversions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    os.path.abspath(source_path),
+                    fingerprint.size,
+                    fingerprint.mtime_ns,
+                    fingerprint.content_hash,
+                    processor_version,
+                    output_path,
+                    time.time_ns(),
+                ),
+            )
+
+    def remove(self, source_path):
+        """Forgets a source file, so that it is converted again."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM conversions WHERE source_path = ?", (os.path.abspath(source_path),)
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM conversions").fetchone()[0]
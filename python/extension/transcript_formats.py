@@ -0,0 +1,123 @@
+import re
+from collections import namedtuple
+
+# Number of bytes read from the start of a file to identify its format.
+SNIFF_BYTES = 64 * 1024
+
+# A format of transcription files:
+# - `transcripts_type` names it and its processor;
+# - `sniff` receives the `TranscriptPrefix` of a file and returns whether the file is of the format;
+# - `match`, optional, receives the whole parsed document and decides when no prefix was conclusive;
+# - `description` is used in progress messages, e.g. "batch transcription".
+TranscriptFormat = namedtuple(
+    "TranscriptFormat", ("transcripts_type", "processor", "sniff", "match", "description")
+)
+
+# JSON strings, including one cut off by the end of the prefix, and structural characters.
+_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*(?:"|\\?\Z)|[{}\[\]:]', re.DOTALL)
+
+_formats = {}
+
+
+class TranscriptPrefix:
+    """The first bytes of a transcription file, with the top-level keys they contain."""
+
+    def __init__(self, data: bytes, complete: bool):
+        """
+        Args:
+            data (bytes): The prefix of the file.
+            complete (bool): Whether the prefix is the whole file.
+        """
+        self.data = data
+        self.complete = complete
+        self._text = None
+        self._keys = None
+
+    @property
+    def text(self) -> str:
+        """The prefix decoded as UTF-8, ignoring a character cut off at its end."""
+        if self._text is None:
+            self._text = self.data.decode("utf-8", errors="ignore")
+        return self._text
+
+    @property
+    def keys(self) -> list:
+        """The keys of the top-level JSON object found in the prefix, in order."""
+        if self._keys is None:
+            self._keys = _scan_top_level_keys(self.text)
+        return self._keys
+
+
+def _scan_top_level_keys(text):
+    # Tokens are found with a regular expression, so string contents are skipped without a
+    # Python-level loop over their characters.
+    keys = []
+    depth = 0
+    previous = None
+    for match in _TOKEN.finditer(text):
+        token = match.group()
+        if token in "{[":
+            depth += 1
+        elif token in "}]":
+            depth -= 1
+        elif token == ":" and depth == 1 and previous is not None and previous.startswith('"'):
+            keys.append(previous[1:-1])
+        previous = token
+    return keys
+
+
+def register_format(transcripts_type, processor, sniff, match=None, description=None):
+    """Registers a format of transcription files, so that `TranscriptsProcessor.convert_file`
+    recognizes and converts it.
+
+    Formats are tried in registration order, so the built-in formats take precedence, and
+    registering a type again replaces its format in place. Pool workers of
+    `TranscriptsProcessor.convert_many` see the formats registered when they start, which, with
+    the "spawn" start method, are only those registered on import.
+
+    Args:
+        transcripts_type (str): The name of the format, unique.
+        processor (TranscriptProcessorBase): The processor converting documents of the format.
+        sniff (callable): Returns whether a `TranscriptPrefix` is the start of a file of the format.
+        match (callable, optional): Returns whether a parsed document is of the format, for files
+            whose prefix was not conclusive. Defaults to none.
+        description (str, optional): The name of the format in messages. Defaults to `transcripts_type`.
+    """
+    _formats[transcripts_type] = TranscriptFormat(
+        transcripts_type, processor, sniff, match, description or transcripts_type
+    )
+
+
+def get_formats() -> list:
+    """Returns the registered `TranscriptFormat`s, in the order they are tried."""
+    return list(_formats.values())
+
+
+def sniff_file(file_path, formats=None):
+    """Identifies the format of a transcription file from its first `SNIFF_BYTES` bytes.
+
+    Args:
+        file_path (str): The transcription file.
+        formats (list, optional): The `TranscriptFormat`s to try. Defaults to the registered ones.
+    Returns:
+        TranscriptFormat: The first format whose sniffer accepts the prefix, or None.
+    """
+    with open(file_path, "rb") as f:
+        data = f.read(SNIFF_BYTES + 1)
+    prefix = TranscriptPrefix(data[:SNIFF_BYTES], complete=len(data) <= SNIFF_BYTES)
+    for transcript_format in get_formats() if formats is None else formats:
+        if transcript_format.sniff(prefix):
+            return transcript_format
+    return None
+
+
+def match_document(document, formats=None):
+    """Identifies the format of a parsed transcription with the `match` callables of the formats.
+
+    Returns:
+        TranscriptFormat: The first format matching the document, or None.
+    """
+    for transcript_format in get_formats() if formats is None else formats:
+        if transcript_format.match is not None and transcript_format.match(document):
+            return transcript_format
+    return None
@@ -1,11 +1,116 @@
+"""Converts transcription files of speech services and Content Understanding to WebVTT.
+
+Run the converter with `python -m python.extension.transcripts_processor <files or directories>`
+from the root of the repository: the module uses package-relative imports, so running the file
+directly as a script fails. Add `--help` for its options.
+"""
+
+import argparse
 import os
 import json
+import re
+import sys
+import time
 import warnings
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
+from pathlib import Path
+
+from .conversion_manifest import ConversionManifest
+from .transcript_formats import get_formats, match_document, register_format, sniff_file
 
 warnings.filterwarnings("ignore")
 
+# Below this many phrases, formatting cues one at a time is faster than going through NumPy.
+VECTORIZE_MIN_PHRASES = 256
+# Number of phrases formatted together when writing a transcript to a stream.
+WRITE_BATCH_SIZE = 4096
+# Where converted files are written unless another directory is given.
+DEFAULT_OUTPUT_DIR = os.path.join("..", "data", "transcripts_processor_output")
+
+# Statuses of a file converted by `TranscriptsProcessor.convert_many`.
+SUCCEEDED = "succeeded"
+SKIPPED = "skipped"
+UNCHANGED = "unchanged"
+FAILED = "failed"
+
+# Recorded in conversion manifests; bump it whenever the output of a processor changes, so that
+# files converted by earlier versions are converted again.
+PROCESSOR_VERSION = "1"
+
+# Larger times are formatted one at a time, as int64 and float64 can no longer represent them exactly.
+_MAX_VECTORIZED_MILLISECONDS = 2 ** 53
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _render_timestamps(np, hours, minutes, seconds, ms, hour_digits):
+    # Writes the digits of each timestamp into a row of bytes, then decodes all rows at once.
+    width = hour_digits + 10
+    characters = np.empty((len(hours), width), dtype=np.uint8)
+    for position in range(hour_digits - 1, -1, -1):
+        hours, characters[:, position] = np.divmod(hours, 10)
+    characters[:, width - 9], characters[:, width - 8] = np.divmod(minutes, 10)
+    characters[:, width - 6], characters[:, width - 5] = np.divmod(seconds, 10)
+    characters[:, width - 3], ms = np.divmod(ms, 100)
+    characters[:, width - 2], characters[:, width - 1] = np.divmod(ms, 10)
+    characters += ord("0")
+    characters[:, [width - 10, width - 7]] = ord(":")
+    characters[:, width - 4] = ord(".")
+    return characters.view(f"S{width}").ravel().astype(f"U{width}").tolist()
+
+
+def _format_milliseconds(np, milliseconds, times, format_timestamp):
+    """Formats an array of milliseconds as "HH:MM:SS.mmm" strings in one vectorized pass.
+
+    Values that are negative, not finite or too large for exact arithmetic are formatted one
+    at a time by calling `format_timestamp` on the corresponding element of `times`.
+    """
+    unsupported = ~((milliseconds >= 0) & (milliseconds < _MAX_VECTORIZED_MILLISECONDS))
+    # Casting truncates toward zero, like int().
+    seconds, ms = np.divmod(np.where(unsupported, 0, milliseconds).astype(np.int64), 1000)
+    minutes, seconds = np.divmod(seconds, 60)
+    hours, minutes = np.divmod(minutes, 60)
+    # Hours take at least two digits and as many as needed beyond, so group rows by hour width.
+    hour_digits = np.full(len(hours), 2)
+    threshold = 100
+    while len(hours) and threshold <= hours.max():
+        hour_digits += hours >= threshold
+        threshold *= 10
+    widths = np.unique(hour_digits).tolist()
+    if len(widths) == 1:
+        timestamps = _render_timestamps(np, hours, minutes, seconds, ms, widths[0])
+    else:
+        timestamps = [None] * len(hours)
+        for width in widths:
+            rows = np.flatnonzero(hour_digits == width)
+            rendered = _render_timestamps(np, hours[rows], minutes[rows], seconds[rows], ms[rows], width)
+            for row, timestamp in zip(rows.tolist(), rendered):
+                timestamps[row] = timestamp
+    for row in np.flatnonzero(unsupported).tolist():
+        timestamps[row] = format_timestamp(times[row].item())
+    return timestamps
+
+
+def _iter_json_items(input_stream, prefix):
+    try:
+        import ijson
+    except ImportError as e:
+        raise ImportError("Streaming transcripts requires ijson: pip install ijson") from e
+    return ijson.items(input_stream, prefix, use_float=True)
+
+
 class TranscriptProcessorBase(ABC):
+    # ijson prefix of the phrases in a transcription file, for processors that can stream them.
+    phrases_prefix = None
+
     def __init__(self, name):
         self.name = name
 
@@ -13,6 +118,75 @@ class TranscriptProcessorBase(ABC):
     def process_transcript(self,  transcript_result):
         pass
 
+    def get_times(self, phrase):
+        """Returns the start and end time of a phrase, in the unit of `format_timestamp`."""
+        raise NotImplementedError(f"{self.name} does not convert individual phrases")
+
+    def get_time_columns(self, np, phrases):
+        """Returns the start and end times of a list of phrases as two NumPy arrays, or None if
+        they cannot be formatted in bulk with the same output as `format_timestamp`."""
+        return None
+
+    def format_timestamps(self, times):
+        """Formats a NumPy array of times, as `format_timestamp` would each of them."""
+        return [self.format_timestamp(time) for time in times.tolist()]
+
+    def format_cue_text(self, phrase):
+        """Returns the voice line of the WebVTT cue of a phrase."""
+        raise NotImplementedError(f"{self.name} does not convert individual phrases")
+
+    def format_cue(self, phrase):
+        """Returns the WebVTT cue of a phrase, without its trailing blank line."""
+        start_time, end_time = self.get_times(phrase)
+        start_time = self.format_timestamp(start_time)
+        end_time = self.format_timestamp(end_time)
+        return f"{start_time} --> {end_time}\n{self.format_cue_text(phrase)}"
+
+    def format_cues(self, phrases):
+        """Returns the WebVTT cues of a list of phrases, as `format_cue` would.
+
+        When NumPy is installed, the timestamps of large lists are formatted in one vectorized
+        pass over their time columns.
+        """
+        np = _import_numpy() if len(phrases) >= VECTORIZE_MIN_PHRASES else None
+        columns = self.get_time_columns(np, phrases) if np is not None else None
+        if columns is None:
+            return [self.format_cue(phrase) for phrase in phrases]
+        start_times = self.format_timestamps(columns[0])
+        end_times = self.format_timestamps(columns[1])
+        format_cue_text = self.format_cue_text
+        return [
+            f"{start_time} --> {end_time}\n{format_cue_text(phrase)}"
+            for start_time, end_time, phrase in zip(start_times, end_times, phrases)
+        ]
+
+    def write_transcript(self, phrases, output):
+        """Writes the WebVTT of an iterable of phrases to a text stream, a batch of cues at a time.
+
+        The output is identical to `process_transcript`, without holding the phrases or the
+        WebVTT in memory.
+        """
+        output.write("WEBVTT\n")
+        phrases = iter(phrases)
+        while True:
+            batch = list(islice(phrases, WRITE_BATCH_SIZE))
+            if not batch:
+                break
+            output.write("".join(f"\n{cue}\n" for cue in self.format_cues(batch)))
+
+    def stream_transcript(self, input_stream, output):
+        """Converts a transcription file to WebVTT with a memory use independent of its length.
+
+        The phrases are parsed incrementally, which requires the optional `ijson` package.
+
+        Args:
+            input_stream (BinaryIO): The transcription file, opened in binary mode.
+            output (TextIO): The stream the WebVTT is written to.
+        """
+        if self.phrases_prefix is None:
+            raise NotImplementedError(f"{self.name} does not support streaming")
+        self.write_transcript(_iter_json_items(input_stream, self.phrases_prefix), output)
+
     # @abstractmethodS
     def get_phrases(self, *args,  transcript_result):
         pass
@@ -22,6 +196,8 @@ class TranscriptProcessorBase(ABC):
         pass
 
 class BatchTranscriptionProcessor(TranscriptProcessorBase):
+    phrases_prefix = "recognizedPhrases.item"
+
     def __init__(self):
         super().__init__(name="BatchTranscriptionProcessor")
 
@@ -39,25 +215,43 @@ class BatchTranscriptionProcessor(TranscriptProcessorBase):
         return f"{hours:02}:{minutes:02}:{seconds:02}.{ms:03}"
 
     
+    def format_timestamps(self, times):
+        np = _import_numpy()
+        if np is None or times.dtype.kind not in "iuf":
+            return super().format_timestamps(times)
+        # Ticks from 2 ** 53 on convert to float inexactly, so they are left to the scalar path as well.
+        milliseconds = np.where(times < _MAX_VECTORIZED_MILLISECONDS, times / 10000, -1)
+        return _format_milliseconds(np, milliseconds, times, self.format_timestamp)
+
+    def get_times(self, phrase):
+        return phrase["offsetInTicks"], phrase["durationInTicks"]
+
+    def get_time_columns(self, np, phrases):
+        offsets = np.array([phrase["offsetInTicks"] for phrase in phrases])
+        durations = np.array([phrase["durationInTicks"] for phrase in phrases])
+        if offsets.dtype.kind not in "iuf" or durations.dtype.kind not in "iuf":
+            return None
+        return offsets, durations
+
+    def format_cue_text(self, phrase):
+        speaker = phrase.get("speaker", "Unknown")
+        text = phrase['nBest'][0]['display']
+        return f"<v Speaker {speaker}>{text}"
+
     def process_transcript(self, fast_transcription_result):
         webvtt_string = ["WEBVTT\n"]
 
         phrases = self.get_phrases(fast_transcription_result)
 
-        for phrase in phrases:
-
-            start_time = self.format_timestamp(phrase["offsetInTicks"])
-            end_time = self.format_timestamp(phrase["durationInTicks"])
-
-            speaker = phrase.get("speaker", "Unknown")
-            text = phrase['nBest'][0]['display']
-            webvtt_string.append(f"{start_time} --> {end_time}")
-            webvtt_string.append(f"<v Speaker {speaker}>{text}")
+        for cue in self.format_cues(phrases):
+            webvtt_string.append(cue)
             webvtt_string.append("")
 
         return "\n".join(webvtt_string)
     
 class FastTranscriptionProcessor(TranscriptProcessorBase):
+    phrases_prefix = "phrases.item"
+
     def __init__(self):
         super().__init__(name="FastTranscriptionProcessor")
 
@@ -71,18 +265,35 @@ class FastTranscriptionProcessor(TranscriptProcessorBase):
         hours, minutes = divmod(minutes, 60)
         return f"{hours:02}:{minutes:02}:{seconds:02}.{ms:03}"
     
+    def format_timestamps(self, times):
+        np = _import_numpy()
+        # Float milliseconds are formatted with their fractional part, which only the scalar path does.
+        if np is None or times.dtype.kind not in "iu":
+            return super().format_timestamps(times)
+        return _format_milliseconds(np, times, times, self.format_timestamp)
+
+    def get_times(self, phrase):
+        return phrase["offsetMilliseconds"], phrase["offsetMilliseconds"] + phrase["durationMilliseconds"]
+
+    def get_time_columns(self, np, phrases):
+        offsets = np.array([phrase["offsetMilliseconds"] for phrase in phrases])
+        durations = np.array([phrase["durationMilliseconds"] for phrase in phrases])
+        if offsets.dtype.kind != "i" or durations.dtype.kind != "i":
+            return None
+        return offsets, offsets + durations
+
+    def format_cue_text(self, phrase):
+        speaker = phrase.get("speaker", "Unknown")
+        text = phrase.get("text")
+        return f"<v Speaker {speaker}>{text}"
+
     def process_transcript(self, fast_transcription_result):
         webvtt_string = ["WEBVTT\n"]
 
         phrases = self.get_phrases(fast_transcription_result)
 
-        for phrase in phrases:
-            start_time = self.format_timestamp(phrase["offsetMilliseconds"])
-            end_time = self.format_timestamp(phrase["offsetMilliseconds"] + phrase["durationMilliseconds"])
-            speaker = phrase.get("speaker", "Unknown")
-            text = phrase.get("text")
-            webvtt_string.append(f"{start_time} --> {end_time}")
-            webvtt_string.append(f"<v Speaker {speaker}>{text}")
+        for cue in self.format_cues(phrases):
+            webvtt_string.append(cue)
             webvtt_string.append("")
 
         return "\n".join(webvtt_string)
@@ -90,17 +301,138 @@ class FastTranscriptionProcessor(TranscriptProcessorBase):
 class CUTranscriptionProcessor(TranscriptProcessorBase):
     def __init__(self):
         super().__init__(name="CUTranscriptionProcessor")
+
+    # The markdown of the first content of an audio or video result, starting with a WebVTT header.
+    markdown_pattern = re.compile(r'"markdown"\s*:\s*"(?:[^"\\]|\\.){0,64}?WEBVTT')
+
+    def sniff(self, prefix):
+        return "result" in prefix.keys and self.markdown_pattern.search(prefix.text) is not None
+
+    def matches(self, cu_content_extraction_result):
+        try:
+            return "WEBVTT" in cu_content_extraction_result["result"]["contents"][0]["markdown"]
+        except (KeyError, IndexError, TypeError):
+            return False
     
     def process_transcript(self, cu_content_extraction_result):
         return cu_content_extraction_result["result"]["contents"][0]["markdown"]
 
+    def stream_transcript(self, input_stream, output):
+        # Only the first content is parsed; the rest of the file is never read.
+        content = next(_iter_json_items(input_stream, "result.contents.item"), None)
+        if content is None:
+            raise ValueError("The transcription has no contents")
+        output.write(content["markdown"])
+
+
+register_format(
+    "batch_transcription",
+    BatchTranscriptionProcessor(),
+    sniff=lambda prefix: "combinedRecognizedPhrases" in prefix.keys,
+    match=lambda document: "combinedRecognizedPhrases" in document,
+    description="batch transcription",
+)
+register_format(
+    "fast_transcription",
+    FastTranscriptionProcessor(),
+    sniff=lambda prefix: "combinedPhrases" in prefix.keys,
+    match=lambda document: "combinedPhrases" in document,
+    description="fast transcription",
+)
+_cu_processor = CUTranscriptionProcessor()
+register_format(
+    "cu_markdown", _cu_processor, sniff=_cu_processor.sniff, match=_cu_processor.matches, description="CU transcription"
+)
+
+
+class ConversionResult:
+    """Outcome of the conversion of one file by `TranscriptsProcessor.convert_many`."""
+
+    __slots__ = ("file_path", "status", "output_file_path", "seconds", "error")
+
+    def __init__(self, file_path, status, output_file_path, seconds, error=None):
+        self.file_path = file_path
+        self.status = status
+        self.output_file_path = output_file_path
+        self.seconds = seconds
+        self.error = error
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class ConversionSummary:
+    """Outcomes of the conversion of many files, in input order, with the total wall time."""
+
+    def __init__(self, results, seconds):
+        self.results = results
+        self.seconds = seconds
+
+    @property
+    def succeeded(self):
+        return [result for result in self.results if result.status == SUCCEEDED]
+
+    @property
+    def skipped(self):
+        return [result for result in self.results if result.status == SKIPPED]
+
+    @property
+    def unchanged(self):
+        return [result for result in self.results if result.status == UNCHANGED]
+
+    @property
+    def failed(self):
+        return [result for result in self.results if result.status == FAILED]
+
+    def to_dict(self):
+        return {
+            "succeeded": len(self.succeeded),
+            "skipped": len(self.skipped),
+            "unchanged": len(self.unchanged),
+            "failed": len(self.failed),
+            "seconds": self.seconds,
+            "results": [result.to_dict() for result in self.results],
+        }
+
+    def __repr__(self):
+        return (
+            f"ConversionSummary(succeeded={len(self.succeeded)}, skipped={len(self.skipped)}, "
+            f"unchanged={len(self.unchanged)}, failed={len(self.failed)}, seconds={self.seconds:.3f})"
+        )
+
+
+def _find_files(directory, pattern, recursive):
+    matches = directory.rglob(pattern) if recursive else directory.glob(pattern)
+    return sorted(path for path in matches if path.is_file())
+
+
+# Processors of the current pool worker, by output directory and manifest path.
+_worker_processors = {}
+
+
+def _convert_file_in_worker(file_path, output_dir, manifest_path):
+    # Runs in pool workers, so it must stay a module-level function.
+    key = (output_dir, manifest_path)
+    processor = _worker_processors.get(key)
+    if processor is None:
+        processor = _worker_processors[key] = TranscriptsProcessor(output_dir=output_dir, manifest_path=manifest_path)
+    return processor._convert_file_quietly(file_path)
+
 
 class TranscriptsProcessor:
-    def __init__(self):
+    def __init__(self, output_dir=DEFAULT_OUTPUT_DIR, manifest_path=None):
+        """
+        Args:
+            output_dir (str, optional): The directory converted files are written to. Defaults
+                to ../data/transcripts_processor_output.
+            manifest_path (str, optional): The SQLite `ConversionManifest` recording converted
+                files, so that `convert_many` skips those unchanged since. Defaults to none.
+        """
+        self.output_dir = output_dir
+        self.manifest_path = manifest_path
+        self.manifest = ConversionManifest(manifest_path) if manifest_path else None
         self.transcripts = {
-            "batch_transcription": BatchTranscriptionProcessor(),
-            "fast_transcription": FastTranscriptionProcessor(),
-            "cu_markdown": CUTranscriptionProcessor()
+            transcript_format.transcripts_type: transcript_format.processor for transcript_format in get_formats()
         }
     
     def get_transcriptionProcessor(self, transcripts_type)-> TranscriptProcessorBase:
@@ -133,40 +465,222 @@ class TranscriptsProcessor:
         print("CU to WebVTT Conversion completed.")
         return result
 
+    def detect_format(self, file_path):
+        """Returns the type of a transcription file identified from its first bytes, or None.
+
+        Formats are registered with `register_format`.
+        """
+        transcript_format = sniff_file(file_path)
+        return transcript_format.transcripts_type if transcript_format is not None else None
+
     def convert_file(self, file_path):
-        converted_text = ''
         converted_text_filepath = ''
-        transcripts = self.load_transcription_fromLocal(file_path)
-        if "combinedRecognizedPhrases" in transcripts:
-            print("Processing a batch transcription file.")
-            converted_text = self.convertBTtoWebVTT(transcripts)
-            converted_text_filepath = self.save_converted_file(converted_text, file_path)
-        elif "combinedPhrases" in transcripts:
-            print("processing a fast transcription file.")
-            converted_text = self.convertFTtoWebVTT(transcripts)
-            converted_text_filepath = self.save_converted_file(converted_text, file_path)
-        elif "WEBVTT" in str(transcripts):
-            print("processing a CU transcription file.")
-            converted_text = self.extractCUWebVTT(transcripts)
+        transcript_format, converted_text = self._convert_document(file_path)
+        print("Load transcription completed.")
+        if transcript_format is not None:
+            print(f"Processing a {transcript_format.description} file.")
+            description = transcript_format.description
+            print(f"{description[:1].upper()}{description[1:]} to WebVTT conversion completed.")
             converted_text_filepath = self.save_converted_file(converted_text, file_path)
         else:
             print("No supported conversation transcription found. Skipping conversion.")
             # raise ValueError("An error occurred during the conversion process")
         
         return converted_text, converted_text_filepath
+
+    def _convert_document(self, file_path):
+        """Converts a transcription file to WebVTT text without writing or printing anything.
+
+        Returns:
+            tuple: `(transcript_format, converted_text)`, or `(None, "")` if the file holds no
+                supported transcription.
+        """
+        transcript_format = sniff_file(file_path)
+        with open(file_path, "r", encoding="utf-8") as f:
+            transcripts = json.load(f)
+        if transcript_format is None:
+            # The format may show only past the prefix, e.g. behind a long first field.
+            transcript_format = match_document(transcripts)
+        if transcript_format is None:
+            return None, ""
+        processor = self.get_transcriptionProcessor(transcript_format.transcripts_type)
+        return transcript_format, processor.process_transcript(transcripts)
     
-    def save_converted_file(self, converted_text, file_path):
-        temp_file = os.path.join("..", "data", "transcripts_processor_output", f"{os.path.basename(file_path)}.convertedTowebVTT.txt")
-        output_dir = os.path.dirname(temp_file)
-        if not os.path.exists(output_dir):
+    def stream_convert_file(self, file_path, transcripts_type=None, output_file_path=None):
+        """Converts a transcription file to WebVTT without loading it, writing cues as they are parsed.
+
+        Unlike `convert_file`, memory use does not grow with the length of the transcript, which
+        suits day-long recordings. Requires the optional `ijson` package.
+
+        Args:
+            file_path (str): The transcription file.
+            transcripts_type (str, optional): "batch_transcription", "fast_transcription", "cu_markdown"
+                or a registered type. Defaults to the type identified by `detect_format`.
+            output_file_path (str, optional): Where to write the WebVTT. Defaults to the path
+                used by `save_converted_file`.
+
+        Returns:
+            str: The path of the WebVTT file.
+
+        Raises:
+            ValueError: If no type is given and the format of the file cannot be identified, or
+                the transcription holds nothing to convert.
+        """
+        if transcripts_type is None:
+            transcripts_type = self.detect_format(file_path)
+            if transcripts_type is None:
+                raise ValueError(f"'{file_path}' is not a supported transcription file")
+        processor = self.get_transcriptionProcessor(transcripts_type)
+        if output_file_path is None:
+            output_file_path = self.get_converted_file_path(file_path)
+        output_dir = os.path.dirname(output_file_path)
+        if output_dir:
             os.makedirs(output_dir, exist_ok=True)
- 
         try:
-            with open(temp_file, 'w', encoding='utf-8') as file:
-                file.write(str(converted_text))
+            with open(file_path, "rb") as input_stream, open(output_file_path, "w", encoding="utf-8") as output:
+                processor.stream_transcript(input_stream, output)
+        except BaseException:
+            # Do not leave a truncated WebVTT file behind.
+            if os.path.exists(output_file_path):
+                os.remove(output_file_path)
+            raise
+        print(f"Conversion completed. The result has been saved to '{output_file_path}'")
+        return output_file_path
+
+    def get_converted_file_path(self, file_path):
+        return os.path.join(self.output_dir, f"{os.path.basename(file_path)}.convertedTowebVTT.txt")
+
+    def convert_many(self, file_paths, max_workers=None):
+        """Converts many files like `convert_file`, spread over a pool of processes.
+
+        Nothing is printed: the outcome of each file is returned for the caller to report. A file that is not a supported
+        transcription is skipped, and an error on one file does not stop the others. With a
+        manifest, files converted before and unchanged since are reported as unchanged without
+        being read.
+
+        Args:
+            file_paths (Iterable[str]): The transcription files.
+            max_workers (int, optional): The number of worker processes. Defaults to the number of
+                CPUs; 1 converts the files in the current process.
+
+        Returns:
+            ConversionSummary: The outcome of every file, in input order.
+        """
+        file_paths = [str(file_path) for file_path in file_paths]
+        start = time.perf_counter()
+        if max_workers == 1 or len(file_paths) <= 1:
+            results = [self._convert_file_quietly(file_path) for file_path in file_paths]
+        else:
+            workers = max_workers or os.cpu_count() or 1
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                # Batches of files amortize the inter-process round trips without starving workers.
+                chunksize = max(1, min(32, len(file_paths) // (workers * 4)))
+                results = list(
+                    executor.map(
+                        _convert_file_in_worker,
+                        file_paths,
+                        repeat(self.output_dir),
+                        repeat(self.manifest_path),
+                        chunksize=chunksize,
+                    )
+                )
+        return ConversionSummary(results, time.perf_counter() - start)
+
+    def _convert_file_quietly(self, file_path):
+        start = time.perf_counter()
+        fingerprint = None
+        try:
+            if self.manifest is not None:
+                entry = self.manifest.lookup(file_path, PROCESSOR_VERSION)
+                expected_output_path = os.path.abspath(self.get_converted_file_path(file_path))
+                if entry is not None and entry.output_path in (None, expected_output_path):
+                    return ConversionResult(file_path, UNCHANGED, entry.output_path, time.perf_counter() - start)
+                fingerprint = self.manifest.get_fingerprint(file_path)
+            transcript_format, converted_text = self._convert_document(file_path)
+            output_file_path = None
+            if transcript_format is not None:
+                output_file_path = self._write_converted_file(converted_text, file_path)
+            if fingerprint is not None:
+                self.manifest.record(file_path, fingerprint, PROCESSOR_VERSION, output_file_path)
+        except Exception as e:
+            return ConversionResult(file_path, FAILED, None, time.perf_counter() - start, f"{type(e).__name__}: {e}")
+        status = SUCCEEDED if output_file_path else SKIPPED
+        return ConversionResult(file_path, status, output_file_path or None, time.perf_counter() - start)
+
+    def convert_directory(self, directory, pattern="*.json", recursive=False, max_workers=None):
+        """Converts every file of a directory matching a glob pattern with `convert_many`.
+
+        Converted files are named after the source file only, so with `recursive` files of the same
+        name in different subdirectories overwrite each other's output.
+
+        Args:
+            directory (str): The directory holding the transcription files.
+            pattern (str, optional): The glob pattern of the files to convert. Defaults to "*.json".
+            recursive (bool, optional): Whether to include subdirectories. Defaults to False.
+            max_workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+
+        Returns:
+            ConversionSummary: The outcome of every file, in path order.
+        """
+        directory = Path(directory)
+        if not directory.is_dir():
+            raise ValueError(f"'{directory}' is not a directory")
+        return self.convert_many(_find_files(directory, pattern, recursive), max_workers=max_workers)
+
+    def save_converted_file(self, converted_text, file_path):
+        try:
+            temp_file = self._write_converted_file(converted_text, file_path)
             print(f"Conversion completed. The result has been saved to '{temp_file}'")
             return temp_file
         except Exception as e:
             print(f"An error occurred during the conversion process: {e}")
             return None
-        
+
+    def _write_converted_file(self, converted_text, file_path):
+        """Writes converted text next to the other outputs and returns its path; raises on errors."""
+        temp_file = self.get_converted_file_path(file_path)
+        output_dir = os.path.dirname(temp_file)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        with open(temp_file, 'w', encoding='utf-8') as file:
+            file.write(str(converted_text))
+        return temp_file
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m python.extension.transcripts_processor",
+        description="Convert transcription files to WebVTT. Run from the root of the repository.",
+    )
+    parser.add_argument("paths", nargs="+", help="Transcription files, or directories of them.")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR, help="Where to write the converted files.")
+    parser.add_argument("--workers", type=int, help="Number of worker processes. Defaults to the number of CPUs.")
+    parser.add_argument("--pattern", default="*.json", help="Glob pattern of the files to convert in directories.")
+    parser.add_argument("--recursive", action="store_true", help="Include the subdirectories of directories.")
+    parser.add_argument("--manifest", help="SQLite manifest of converted files, to skip the unchanged ones.")
+    parser.add_argument("--json", action="store_true", help="Print the summary of every file as JSON.")
+    args = parser.parse_args(argv)
+
+    file_paths = []
+    for path in map(Path, args.paths):
+        if path.is_dir():
+            file_paths.extend(_find_files(path, args.pattern, args.recursive))
+        else:
+            file_paths.append(path)
+    processor = TranscriptsProcessor(output_dir=args.output_dir, manifest_path=args.manifest)
+    summary = processor.convert_many(file_paths, max_workers=args.workers)
+
+    if args.json:
+        print(json.dumps(summary.to_dict(), indent=2))
+    else:
+        for result in summary.failed:
+            print(f"Failed: {result.file_path}: {result.error}", file=sys.stderr)
+        print(
+            f"Converted {len(summary.succeeded)} files, skipped {len(summary.skipped)}, "
+            f"unchanged {len(summary.unchanged)}, failed {len(summary.failed)} in {summary.seconds:.2f} s."
+        )
+    return 1 if summary.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+import bisect
+import logging
+import threading
+from collections import namedtuple
+
+# One HTTP call made by the client. `kind` is "submit", "poll", "image" or "management";
+# `start_time` is a Unix timestamp, `status_code` is None and `error` set if no response came back.
+# For streamed responses (`stream_result`, image downloads) `duration_seconds` ends when the
+# headers arrive, not when the body has been read, and `bytes_received` is their Content-Length.
+RequestEvent = namedtuple(
+    "RequestEvent",
+    (
+        "kind",
+        "method",
+        "url",
+        "start_time",
+        "duration_seconds",
+        "status_code",
+        "bytes_sent",
+        "bytes_received",
+        "error",
+    ),
+)
+
+# One long-running operation, from its submission, or its first poll when the submit time is
+# unknown, to its completion. `status` is "succeeded", "failed" or "timeout".
+OperationEvent = namedtuple(
+    "OperationEvent",
+    ("operation_location", "start_time", "duration_seconds", "polls", "status"),
+)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+POLL_COUNT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+BYTE_BUCKETS = (1 << 10, 1 << 14, 1 << 16, 1 << 18, 1 << 20, 1 << 22, 1 << 24, 1 << 26, 1 << 28, 1 << 30)
+
+
+def classify_request(method: str, url: str) -> str:
+    """Returns the kind of an HTTP call of the client from its method and URL."""
+    if "/analyzerResults/" in url:
+        return "image" if "/images/" in url else "poll"
+    if method == "POST" and ":analyze" in url:
+        return "submit"
+    return "management"
+
+
+class Histogram:
+    """Thread-safe cumulative histogram with optional labels, in the Prometheus model."""
+
+    def __init__(self, name: str, documentation: str, buckets, label_names=()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self.label_names = tuple(label_names)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        """Records a value for the given label values."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                # Counts per bucket, then the overflow count, the sum and the total count.
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def snapshot(self) -> dict:
+        """Returns `{label_values: {"buckets": {le: cumulative_count}, "sum": ..., "count": ...}}`."""
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+        snapshot = {}
+        for labels, values in series.items():
+            cumulative = 0
+            buckets = {}
+            for le, count in zip(self.buckets + (float("inf"),), values):
+                cumulative += count
+                buckets[le] = cumulative
+            snapshot[labels] = {"buckets": buckets, "sum": values[-2], "count": values[-1]}
+        return snapshot
+
+    def render_prometheus(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self.snapshot().items()):
+            pairs = [f'{name}="{value}"' for name, value in zip(self.label_names, labels)]
+            for le, count in series["buckets"].items():
+                le_label = "+Inf" if le == float("inf") else f"{le:g}"
+                bucket_labels = ",".join(pairs + [f'le="{le_label}"'])
+                lines.append(f"{self.name}_bucket{{{bucket_labels}}} {count}")
+            suffix = f"{{{','.join(pairs)}}}" if pairs else ""
+            lines.append(f"{self.name}_sum{suffix} {series['sum']:g}")
+            lines.append(f"{self.name}_count{suffix} {series['count']}")
+        return "\n".join(lines)
+
+
+class Instrumentation:
+    """Collects latency, poll and size histograms of a client and forwards its events to hooks.
+
+    Pass an instance as `instrumentation` to the client. A client without instrumentation skips
+    all timing and bookkeeping, so the overhead when disabled is one attribute check per call.
+    """
+
+    def __init__(self, hooks=()):
+        """
+        Args:
+            hooks (Iterable[callable], optional): Callables receiving every `RequestEvent` and
+                `OperationEvent`, e.g. an `OpenTelemetryHook`. Exceptions raised by hooks are logged, with their
+                traceback the first time each hook fails, and never reach the calls being recorded.
+        """
+        self.hooks = list(hooks)
+        self._logger = logging.getLogger(__name__)
+        self._failed_hooks = set()
+        self.request_duration = Histogram(
+            "cu_request_duration_seconds",
+            "Duration of HTTP calls to the service; kind=\"submit\" is the submit latency.",
+            LATENCY_BUCKETS,
+            ("kind",),
+        )
+        self.request_bytes_sent = Histogram(
+            "cu_request_bytes_sent", "Bytes uploaded per HTTP call.", BYTE_BUCKETS, ("kind",)
+        )
+        self.request_bytes_received = Histogram(
+            "cu_request_bytes_received", "Bytes downloaded per HTTP call.", BYTE_BUCKETS, ("kind",)
+        )
+        self.operation_duration = Histogram(
+            "cu_operation_duration_seconds",
+            "Time from the submission of an operation to its completion.",
+            LATENCY_BUCKETS,
+            ("status",),
+        )
+        self.operation_polls = Histogram(
+            "cu_operation_polls", "Number of polls per operation.", POLL_COUNT_BUCKETS, ("status",)
+        )
+        self._requests = {}
+        self._requests_lock = threading.Lock()
+
+    def add_hook(self, hook: callable):
+        self.hooks.append(hook)
+
+    def record_request(self, event: RequestEvent):
+        """Records one HTTP call and forwards it to the hooks."""
+        self.request_duration.observe(event.duration_seconds, event.kind)
+        self.request_bytes_sent.observe(event.bytes_sent, event.kind)
+        self.request_bytes_received.observe(event.bytes_received, event.kind)
+        status = "error" if event.status_code is None else str(event.status_code)
+        with self._requests_lock:
+            key = (event.kind, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+        self._emit(event)
+
+    def record_operation(self, event: OperationEvent):
+        """Records the completion of an operation and forwards it to the hooks."""
+        self.operation_duration.observe(event.duration_seconds, event.status)
+        self.operation_polls.observe(event.polls, event.status)
+        self._emit(event)
+
+    def render_prometheus(self) -> str:
+        """Returns the metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP cu_requests_total HTTP calls to the service by kind and status code.",
+            "# TYPE cu_requests_total counter",
+        ]
+        with self._requests_lock:
+            requests = sorted(self._requests.items())
+        for (kind, status), count in requests:
+            lines.append(f'cu_requests_total{{kind="{kind}",status="{status}"}} {count}')
+        histograms = (
+            self.request_duration,
+            self.request_bytes_sent,
+            self.request_bytes_received,
+            self.operation_duration,
+            self.operation_polls,
+        )
+        return "\n".join(lines + [histogram.render_prometheus() for histogram in histograms]) + "\n"
+
+    def _emit(self, event):
+        for hook in self.hooks:
+            try:
+                hook(event)
+            except Exception:
+                if id(hook) in self._failed_hooks:
+                    self._logger.debug(f"Instrumentation hook {hook!r} failed again.", exc_info=True)
+                else:
+                    self._failed_hooks.add(id(hook))
+                    self._logger.exception(
+                        f"Instrumentation hook {hook!r} failed; further failures are logged at debug level."
+                    )
+
+
+class OpenTelemetryHook:
+    """Instrumentation hook exporting every HTTP call and operation as an OpenTelemetry span.
+
+    Requires the optional `opentelemetry-api` package; spans go to the tracer provider
+    configured by the application.
+    """
+
+    def __init__(self, tracer_provider=None):
+        try:
+            from opentelemetry import trace
+        except ImportError as e:
+            raise ImportError(
+                "OpenTelemetry spans require opentelemetry-api: pip install opentelemetry-api"
+            ) from e
+        self._trace = trace
+        self._tracer = trace.get_tracer(__name__, tracer_provider=tracer_provider)
+
+    def __call__(self, event):
+        start_ns = int(event.start_time * 1e9)
+        if isinstance(event, RequestEvent):
+            attributes = {
+                "http.request.method": event.method,
+                "url.full": event.url,
+                "content_understanding.request.kind": event.kind,
+                "http.request.body.size": event.bytes_sent,
+                "http.response.body.size": event.bytes_received,
+            }
+            if event.status_code is not None:
+                attributes["http.response.status_code"] = event.status_code
+            span = self._tracer.start_span(
+                f"content_understanding.{event.kind}",
+                kind=self._trace.SpanKind.CLIENT,
+                start_time=start_ns,
+                attributes=attributes,
+            )
+            if event.error is not None:
+                span.record_exception(event.error)
+            if event.error is not None or event.status_code >= 400:
+                span.set_status(self._trace.Status(self._trace.StatusCode.ERROR))
+        else:
+            span = self._tracer.start_span(
+                "content_understanding.operation",
+                start_time=start_ns,
+                attributes={
+                    "content_understanding.operation.polls": event.polls,
+                    "content_understanding.operation.status": event.status,
+                },
+            )
+            if event.status != "succeeded":
+                span.set_status(self._trace.Status(self._trace.StatusCode.ERROR))
+        span.end(end_time=start_ns + int(event.duration_seconds * 1e9))
@@ -0,0 +1,248 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+
+from .polling import get_poll_delay, get_polling_strategy, parse_retry_after
+from .throttling import RETRYABLE_STATUS_CODES
+
+
+class _PendingOperation:
+    __slots__ = (
+        "operation_location",
+        "future",
+        "polling_strategy",
+        "result_format",
+        "start_time",
+        "submitted_at",
+        "deadline",
+        "attempt",
+        "throttled",
+        "reserved",
+    )
+
+    def __init__(
+        self, operation_location, future, polling_strategy, result_format, start_time, submitted_at, deadline
+    ):
+        self.operation_location = operation_location
+        self.future = future
+        self.polling_strategy = polling_strategy
+        self.result_format = result_format
+        self.start_time = start_time
+        self.submitted_at = submitted_at
+        self.deadline = deadline
+        self.attempt = 0
+        self.throttled = 0
+        self.reserved = False
+
+
+class PollScheduler:
+    """Polls many pending operations from a small, fixed pool of worker threads.
+
+    Pending operations are kept in a min-heap keyed by the time their next poll is due.
+    Each worker sleeps until the earliest operation is due, polls it, and either resolves
+    its future or pushes it back with its next due time. Waiting on hundreds of operations
+    therefore costs heap entries rather than sleeping threads. Workers never sleep for one
+    operation: waits for the rate limiter and throttled polls push it back instead.
+    """
+
+    def __init__(self, client, max_workers: int = 1):
+        """
+        Args:
+            client (AzureContentUnderstandingClient): The client whose session and credentials are used to poll.
+            max_workers (int, optional): The number of polling threads. Defaults to 1.
+        """
+        if max_workers < 1:
+            raise ValueError("Max workers must be at least 1.")
+        self._client = client
+        self._max_workers = max_workers
+        self._logger = logging.getLogger(__name__)
+        self._heap = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._workers = []
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        with self._condition:
+            return len(self._heap)
+
+    def register(
+        self,
+        response,
+        timeout_seconds: int = 120,
+        polling_interval_seconds: float = None,
+        polling_strategy=None,
+        result_format: str = "json",
+        submitted_at: float = None,
+    ) -> Future:
+        """Registers an operation to be polled until it completes, fails or times out.
+
+        Args:
+            response (Response | str): The initial response object containing the operation location,
+                or the operation location of an operation begun earlier.
+            timeout_seconds (int, optional): The maximum number of seconds to wait for the operation to complete. Defaults to 120.
+            polling_interval_seconds (float, optional): A fixed number of seconds to wait between polling attempts. Defaults to None.
+            polling_strategy (PollingStrategy | str, optional): The strategy deciding the wait between polling attempts,
+                or a media type key of `POLLING_STRATEGIES`. Defaults to exponential backoff.
+            result_format (str, optional): "json", "bytes", "lazy" or "model", see `poll_result` of the client. Defaults to "json".
+            submitted_at (float, optional): The time the operation was submitted, from which its duration is recorded.
+                Defaults to the time it is registered.
+
+        Raises:
+            ValueError: If the operation location is not found in the response headers.
+            RuntimeError: If the scheduler is closed.
+
+        Returns:
+            Future: A future resolved with the result of the completed operation, or with
+                the exception raised while polling it. Callbacks can be attached with `add_done_callback`.
+        """
+        operation_location = self._client._get_operation_location(response)
+        now = time.time()
+        operation = _PendingOperation(
+            operation_location,
+            Future(),
+            get_polling_strategy(polling_strategy, polling_interval_seconds),
+            result_format,
+            now,
+            submitted_at or now,
+            now + timeout_seconds,
+        )
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Poll scheduler is closed.")
+            self._push(operation, now)
+            if len(self._workers) < self._max_workers:
+                worker = threading.Thread(
+                    target=self._run, name=f"cu-poll-{len(self._workers)}", daemon=True
+                )
+                self._workers.append(worker)
+                worker.start()
+        return operation.future
+
+    def close(self):
+        """Stops the workers and cancels the futures of operations still pending."""
+        with self._condition:
+            self._closed = True
+            pending, self._heap = self._heap, []
+            self._condition.notify_all()
+        for _, _, operation in pending:
+            operation.future.cancel()
+
+    def _push(self, operation, due_time):
+        # Callers hold the condition.
+        heapq.heappush(self._heap, (due_time, next(self._sequence), operation))
+        if self._heap[0][2] is operation:
+            self._condition.notify()
+
+    def _next_due(self):
+        with self._condition:
+            while not self._closed:
+                if self._heap:
+                    wait_time = self._heap[0][0] - time.time()
+                    if wait_time <= 0:
+                        return heapq.heappop(self._heap)[2]
+                    self._condition.wait(wait_time)
+                else:
+                    self._condition.wait()
+            return None
+
+    def _run(self):
+        while True:
+            operation = self._next_due()
+            if operation is None:
+                return
+            if operation.future.cancelled():
+                continue
+            next_due_time = self._poll(operation)
+            if next_due_time is not None:
+                with self._condition:
+                    if self._closed:
+                        operation.future.cancel()
+                    else:
+                        self._push(operation, next_due_time)
+
+    def _poll(self, operation):
+        """Polls one operation once and returns the time of its next poll, or None once resolved."""
+        now = time.time()
+        if now > operation.deadline:
+            self._client._record_operation(
+                operation.operation_location, operation.submitted_at, operation.attempt, "timeout"
+            )
+            self._resolve(
+                operation.future,
+                exception=TimeoutError(
+                    f"Operation timed out after {operation.deadline - operation.start_time:.2f} seconds."
+                ),
+            )
+            return None
+        client = self._client
+        if client._rate_limiter is not None and not operation.reserved:
+            wait_time = client._rate_limiter.reserve()
+            if wait_time > 0:
+                # The token is taken; poll once it has accumulated.
+                operation.reserved = True
+                return now + wait_time
+        operation.reserved = False
+        try:
+            response = client._send_request_once(
+                "GET",
+                operation.operation_location,
+                reserved=True,
+                headers=client._headers,
+                timeout=client._timeout,
+            )
+            if response.status_code in RETRYABLE_STATUS_CODES and operation.throttled < client._max_retries:
+                operation.throttled += 1
+                delay = parse_retry_after(response.headers.get("Retry-After"))
+                if delay is None:
+                    delay = client._retry_backoff.get_delay(operation.throttled - 1)
+                self._logger.warning(
+                    f"Poll throttled with status {response.status_code}, retry {operation.throttled}/{client._max_retries} in {delay:.2f} seconds."
+                )
+                response.close()
+                return min(time.time() + delay, operation.deadline)
+            operation.throttled = 0
+            response.raise_for_status()
+            operation.attempt += 1
+            result = self._client._get_poll_outcome(
+                response, operation.operation_location, operation.result_format
+            )
+        except RuntimeError as e:
+            self._client._record_operation(
+                operation.operation_location, operation.submitted_at, operation.attempt, "failed"
+            )
+            self._resolve(operation.future, exception=e)
+            return None
+        except Exception as e:
+            self._resolve(operation.future, exception=e)
+            return None
+        if result is not None:
+            self._logger.info(
+                f"Request result is ready after {now - operation.start_time:.2f} seconds and {operation.attempt} polls."
+            )
+            self._client._record_operation(
+                operation.operation_location, operation.submitted_at, operation.attempt, "succeeded"
+            )
+            self._resolve(operation.future, result=result)
+            return None
+        delay = get_poll_delay(operation.polling_strategy, operation.attempt - 1, response.headers)
+        return min(time.time() + delay, operation.deadline)
+
+    def _resolve(self, future, result=None, exception=None):
+        # The caller may cancel the future at any time while it is pending.
+        try:
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+        except InvalidStateError:
+            pass
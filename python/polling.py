@@ -0,0 +1,172 @@
+import math
+import random
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+from .analyze_inputs import get_input_name
+
+
+class PollingStrategy:
+    """Decides how long to wait before the next poll of a long-running operation."""
+
+    def get_delay(self, attempt: int) -> float:
+        """Returns the number of seconds to wait after the given poll attempt.
+
+        Args:
+            attempt (int): The zero-based number of polls already made.
+        Returns:
+            float: The number of seconds to wait before polling again.
+        """
+        raise NotImplementedError
+
+
+class FixedPolling(PollingStrategy):
+    """Polls at a constant interval."""
+
+    def __init__(self, interval_seconds: float = 2):
+        if interval_seconds < 0:
+            raise ValueError("Polling interval must not be negative.")
+        self.interval_seconds = interval_seconds
+
+    def get_delay(self, attempt: int) -> float:
+        return self.interval_seconds
+
+
+class ExponentialBackoffPolling(PollingStrategy):
+    """Polls quickly at first, then backs off exponentially with jitter up to a cap.
+
+    Short operations complete close to their real finish time, while long ones are
+    polled rarely enough not to spend the request quota of the resource.
+    """
+
+    def __init__(
+        self,
+        initial_seconds: float = 0.5,
+        max_seconds: float = 10,
+        multiplier: float = 2,
+        jitter: float = 0.2,
+    ):
+        if initial_seconds <= 0 or max_seconds < initial_seconds:
+            raise ValueError("Polling delays must be positive and the cap at least the initial delay.")
+        if multiplier < 1:
+            raise ValueError("Backoff multiplier must be at least 1.")
+        if not 0 <= jitter < 1:
+            raise ValueError("Jitter must be in [0, 1).")
+        self.initial_seconds = initial_seconds
+        self.max_seconds = max_seconds
+        self.multiplier = multiplier
+        self.jitter = jitter
+
+    def get_delay(self, attempt: int) -> float:
+        # Cap the exponent so large attempt counts cannot overflow the float.
+        delay = min(
+            self.max_seconds, self.initial_seconds * self.multiplier ** min(attempt, 64)
+        )
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+# Default strategies per media type: images and documents usually finish within seconds,
+# audio and video can take as long as the media itself.
+POLLING_STRATEGIES = {
+    "image": ExponentialBackoffPolling(initial_seconds=0.25, max_seconds=2),
+    "document": ExponentialBackoffPolling(initial_seconds=0.5, max_seconds=5),
+    "audio": ExponentialBackoffPolling(initial_seconds=1, max_seconds=15),
+    "video": ExponentialBackoffPolling(initial_seconds=2, max_seconds=30),
+    "default": ExponentialBackoffPolling(initial_seconds=0.5, max_seconds=10),
+}
+
+_MEDIA_TYPES_BY_EXTENSION = {
+    ".jpg": "image", ".jpeg": "image", ".png": "image", ".bmp": "image",
+    ".tif": "image", ".tiff": "image", ".heif": "image", ".heic": "image",
+    ".pdf": "document", ".docx": "document", ".xlsx": "document", ".pptx": "document",
+    ".txt": "document", ".html": "document", ".md": "document", ".rtf": "document",
+    ".wav": "audio", ".mp3": "audio", ".m4a": "audio", ".flac": "audio",
+    ".ogg": "audio", ".opus": "audio", ".wma": "audio", ".aac": "audio",
+    ".mp4": "video", ".mov": "video", ".avi": "video", ".mkv": "video",
+    ".wmv": "video", ".flv": "video", ".webm": "video", ".m4v": "video",
+}
+
+
+def get_media_type(file_location) -> str:
+    """Guesses the media type of an analyze input from the extension of its path, URL or file name.
+
+    Args:
+        file_location (str | Path | BinaryIO | bytes): The input of the analyze call. Streams are
+            guessed from their file name, in-memory content falls back to "default".
+    Returns:
+        str: One of "image", "document", "audio", "video" or "default" if unknown.
+    """
+    suffix = Path(get_input_name(file_location).split("?")[0]).suffix.lower()
+    return _MEDIA_TYPES_BY_EXTENSION.get(suffix, "default")
+
+
+def get_polling_strategy(polling_strategy=None, polling_interval_seconds=None) -> PollingStrategy:
+    """Resolves the polling strategy to use for an operation.
+
+    Args:
+        polling_strategy (PollingStrategy | str, optional): A strategy, or a media type key of
+            `POLLING_STRATEGIES`. Defaults to the "default" strategy.
+        polling_interval_seconds (float, optional): A fixed polling interval, kept for callers of the
+            previous fixed-interval API. Takes precedence when given.
+    Returns:
+        PollingStrategy: The strategy to use.
+    """
+    if polling_interval_seconds is not None:
+        return FixedPolling(polling_interval_seconds)
+    if polling_strategy is None:
+        return POLLING_STRATEGIES["default"]
+    if isinstance(polling_strategy, PollingStrategy):
+        return polling_strategy
+    if polling_strategy not in POLLING_STRATEGIES:
+        raise ValueError(f"'{polling_strategy}' is not a known polling strategy.")
+    return POLLING_STRATEGIES[polling_strategy]
+
+
+# Longest Retry-After honored; farther hints are treated as this, so a bogus header cannot
+# stall a caller for hours. Callers also stop waiting at their own timeout.
+MAX_RETRY_AFTER_SECONDS = 600
+
+
+def parse_retry_after(value, max_seconds: float = MAX_RETRY_AFTER_SECONDS) -> float:
+    """Parses a Retry-After header given either in seconds or as an HTTP date.
+
+    Args:
+        value (str): The header value, possibly None.
+        max_seconds (float, optional): The longest wait to return, so that a far-off hint cannot
+            stall the caller. Defaults to `MAX_RETRY_AFTER_SECONDS`; None for no cap.
+    Returns:
+        float: The number of seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            delay = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError, OverflowError):
+            return None
+    # "nan" and "inf" parse as floats but are not waits.
+    if not math.isfinite(delay):
+        return None
+    delay = max(0.0, delay)
+    return delay if max_seconds is None else min(delay, max_seconds)
+
+
+def get_poll_delay(polling_strategy: PollingStrategy, attempt: int, headers) -> float:
+    """Returns the wait before the next poll: the delay of the polling strategy, extended to the
+    Retry-After sent by the service, which is never undercut.
+
+    Args:
+        polling_strategy (PollingStrategy): The strategy used when the service sends no hint.
+        attempt (int): The zero-based number of polls already made.
+        headers (Mapping): The headers of the last poll response.
+    Returns:
+        float: The number of seconds to wait before polling again.
+    """
+    delay = polling_strategy.get_delay(attempt)
+    retry_after = parse_retry_after(headers.get("Retry-After"))
+    if retry_after is not None:
+        return max(delay, retry_after)
+    return delay
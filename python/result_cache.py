@@ -0,0 +1,266 @@
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Eviction frees space down to this fraction of `max_bytes`, so that a full cache is scanned
+# once per many puts rather than on each of them.
+_EVICTION_TARGET = 0.9
+
+
+def get_cache_key(analyzer_id: str, analyzer_fingerprint: str, input_identity: str) -> str:
+    """Builds the cache key of an analyze operation.
+
+    Args:
+        analyzer_id (str): The ID of the analyzer.
+        analyzer_fingerprint (str): A digest of the analyzer definition, so that recreating an
+            analyzer with the same ID never returns results of the previous definition.
+        input_identity (str): A digest of the input content, or its URL with an ETag.
+    Returns:
+        str: A hex SHA-256 digest identifying the operation.
+    """
+    return hashlib.sha256(
+        "\n".join((analyzer_id, analyzer_fingerprint, input_identity)).encode("utf-8")
+    ).hexdigest()
+
+
+class ResultCache:
+    """Base class of the stores caching final analyze results by content.
+
+    Subclasses implement `_load`, `_store` and `_evict`. Entries older than `max_age_seconds`
+    are treated as misses, and once the store grows past `max_bytes` the least recently
+    used entries are evicted down to 90% of `max_bytes`.
+
+    The total size of the entries is kept as a running count, measured once when the store is
+    opened and updated by every store and removal, so `put` only scans the store when it is
+    over budget, or at most once per `max_age_seconds` to remove expired entries. Entries
+    written by other processes are counted at the next scan.
+    """
+
+    def __init__(self, max_bytes: int = None, max_age_seconds: float = None):
+        """
+        Args:
+            max_bytes (int, optional): The maximum total size of cached results. Defaults to no limit.
+            max_age_seconds (float, optional): The maximum age of a cached result. Defaults to no limit.
+        """
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+        self._counter_lock = threading.Lock()
+        self._total_size = 0
+        self._swept_at = time.time()
+
+    def get(self, key: str):
+        """Returns the cached raw result payload for the key, or None on a miss."""
+        value = self._load(key, time.time())
+        with self._counter_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def put(self, key: str, value: bytes):
+        """Stores the raw result payload for the key, evicting old entries if needed."""
+        now = time.time()
+        self._store(key, bytes(value), now)
+        with self._counter_lock:
+            over_budget = self.max_bytes is not None and self._total_size > self.max_bytes
+            sweep_due = self.max_age_seconds is not None and now - self._swept_at >= self.max_age_seconds
+            if not (over_budget or sweep_due):
+                return
+            self._swept_at = now
+        total_size = self._evict(now)
+        with self._counter_lock:
+            self._total_size = total_size
+
+    def stats(self) -> dict:
+        """Returns the hit and miss counters of the cache."""
+        with self._counter_lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _add_size(self, delta):
+        """Updates the running total size by the bytes stored or removed."""
+        with self._counter_lock:
+            self._total_size += delta
+
+    def _is_expired(self, created_at, now):
+        return self.max_age_seconds is not None and now - created_at > self.max_age_seconds
+
+    def _load(self, key, now):
+        raise NotImplementedError
+
+    def _store(self, key, value, now):
+        raise NotImplementedError
+
+    def _evict(self, now):
+        """Removes expired entries, then, when over `max_bytes`, the least recently used ones
+        down to the eviction target.
+
+        Returns:
+            int: The total size of the entries left.
+        """
+        raise NotImplementedError
+
+
+class DirectoryResultCache(ResultCache):
+    """Caches results as one file per key in a local directory.
+
+    The modification time of a file records when it was stored and its access time when it
+    was last returned, so no separate index is needed. Writes are atomic renames, so several
+    processes can share the directory.
+    """
+
+    def __init__(self, directory, max_bytes: int = None, max_age_seconds: float = None):
+        super().__init__(max_bytes=max_bytes, max_age_seconds=max_age_seconds)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._total_size = self._evict(time.time())
+
+    def _get_path(self, key):
+        return self.directory / f"{key}.json"
+
+    def _load(self, key, now):
+        path = self._get_path(key)
+        try:
+            stat = path.stat()
+            created_at = stat.st_mtime
+            if self._is_expired(created_at, now):
+                path.unlink()
+                self._add_size(-stat.st_size)
+                return None
+            value = path.read_bytes()
+            os.utime(path, (now, created_at))
+            return value
+        except FileNotFoundError:
+            return None
+
+    def _store(self, key, value, now):
+        path = self._get_path(key)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(value)
+            try:
+                replaced_size = path.stat().st_size
+            except FileNotFoundError:
+                replaced_size = 0
+            os.replace(temp_path, path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+        self._add_size(len(value) - replaced_size)
+
+    def _evict(self, now):
+        entries = []
+        total_size = 0
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            if self._is_expired(stat.st_mtime, now):
+                Path(entry.path).unlink(missing_ok=True)
+                continue
+            entries.append((stat.st_atime, stat.st_size, entry.path))
+            total_size += stat.st_size
+        if self.max_bytes is None or total_size <= self.max_bytes:
+            return total_size
+        for _, size, path in sorted(entries):
+            Path(path).unlink(missing_ok=True)
+            total_size -= size
+            if total_size <= self.max_bytes * _EVICTION_TARGET:
+                break
+        return total_size
+
+
+class SQLiteResultCache(ResultCache):
+    """Caches results in a single SQLite database file."""
+
+    def __init__(self, path, max_bytes: int = None, max_age_seconds: float = None):
+        super().__init__(max_bytes=max_bytes, max_age_seconds=max_age_seconds)
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS results_accessed_at ON results (accessed_at)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS results_created_at ON results (created_at)"
+            )
+            (self._total_size,) = self._connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def _load(self, key, now):
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT value, created_at FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if self._is_expired(created_at, now):
+                self._connection.execute("DELETE FROM results WHERE key = ?", (key,))
+                self._add_size(-len(value))
+                return None
+            self._connection.execute(
+                "UPDATE results SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            return value
+
+    def _store(self, key, value, now):
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT size FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results (key, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now),
+            )
+        self._add_size(len(value) - (row[0] if row else 0))
+
+    def _evict(self, now):
+        with self._lock, self._connection:
+            if self.max_age_seconds is not None:
+                self._connection.execute(
+                    "DELETE FROM results WHERE created_at < ?", (now - self.max_age_seconds,)
+                )
+            (total_size,) = self._connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()
+            if self.max_bytes is None or total_size <= self.max_bytes:
+                return total_size
+            evicted = []
+            for key, size in self._connection.execute(
+                "SELECT key, size FROM results ORDER BY accessed_at"
+            ):
+                evicted.append((key,))
+                total_size -= size
+                if total_size <= self.max_bytes * _EVICTION_TARGET:
+                    break
+            self._connection.executemany("DELETE FROM results WHERE key = ?", evicted)
+            return total_size
@@ -0,0 +1,76 @@
+from collections import namedtuple
+
+# An event of a result read incrementally: a "content" event carries a whole content (a
+# document, or a segment of audio or video) and is followed by one "field" event per field
+# of that content, with the field name as `name`.
+ResultEvent = namedtuple("ResultEvent", ("type", "content_index", "name", "value"))
+
+
+class ChunkReader:
+    """Minimal binary file object over bytes already read followed by an iterator of chunks."""
+
+    def __init__(self, prefix: bytes, chunks):
+        self._buffer = bytearray(prefix)
+        self._chunks = iter(chunks)
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
+def tee_chunks(chunks, sink):
+    """Yields the chunks of an iterator, writing each one to a binary file object as well."""
+    for chunk in chunks:
+        sink.write(chunk)
+        yield chunk
+
+
+def _import_ijson():
+    try:
+        import ijson
+    except ImportError as e:
+        raise ImportError("Streaming results requires ijson: pip install ijson") from e
+    return ijson
+
+
+def read_status(stream):
+    """Reads an operation payload incrementally up to its top-level "status".
+
+    Only the parser state is kept in memory, whatever precedes the status. Requires the
+    optional `ijson` package.
+
+    Args:
+        stream (BinaryIO): A binary file object positioned at the start of the payload.
+    Returns:
+        str: The status, or None if the payload has none.
+    """
+    for prefix, event, value in _import_ijson().parse(stream):
+        if prefix == "status" and event == "string":
+            return value
+    return None
+
+
+def iter_result_events(stream):
+    """Parses the payload of a completed operation incrementally into `ResultEvent`s.
+
+    Contents are built one at a time, so peak memory is bounded by the largest content rather
+    than by the whole payload. Requires the optional `ijson` package.
+
+    Args:
+        stream (BinaryIO): A binary file object positioned at the start of the payload.
+    Yields:
+        ResultEvent: A "content" event per content, in order, each followed by its "field" events.
+    """
+    ijson = _import_ijson()
+    for index, content in enumerate(ijson.items(stream, "result.contents.item", use_float=True)):
+        yield ResultEvent("content", index, None, content)
+        for name, field in (content.get("fields") or {}).items():
+            yield ResultEvent("field", index, name, field)
@@ -0,0 +1,618 @@
+import datetime
+import json
+import re
+import threading
+from collections.abc import Mapping, Sequence
+
+RESULT_FORMATS = ("json", "bytes", "lazy", "model")
+
+# The service writes "id" and "status" ahead of the potentially huge "result" object,
+# so the status is found in the first bytes of the payload.
+_STATUS_SNIFF_BYTES = 4096
+_STATUS_PATTERN = re.compile(rb'"status"\s*:\s*"([^"\\]*)"')
+
+
+def sniff_status(body: bytes, max_bytes: int = _STATUS_SNIFF_BYTES):
+    """Finds the top-level "status" of an operation payload by scanning only its prefix.
+
+    Keys nested in objects or arrays are skipped by tracking the nesting depth outside of strings.
+
+    Args:
+        body (bytes): The raw JSON payload.
+        max_bytes (int, optional): The number of leading bytes to scan. Defaults to 4096.
+    Returns:
+        str: The status, or None if it does not appear at the top level of the prefix.
+    """
+    prefix = bytes(body[:max_bytes])
+    depth = 0
+    in_string = False
+    escaped = False
+    for i, byte in enumerate(prefix):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif byte == 0x5C:  # backslash
+                escaped = True
+            elif byte == 0x22:  # quote
+                in_string = False
+        elif byte == 0x22:
+            if depth == 1:
+                match = _STATUS_PATTERN.match(prefix, i)
+                if match:
+                    return match.group(1).decode("utf-8")
+            in_string = True
+        elif byte in (0x7B, 0x5B):  # { [
+            depth += 1
+        elif byte in (0x7D, 0x5D):  # } ]
+            depth -= 1
+    return None
+
+
+class LazyAnalyzeResult(Mapping):
+    """Read-only view over the raw JSON payload of a completed operation.
+
+    The status is available without decoding the payload; the full document is only
+    decoded, once, the first time any key is accessed.
+    """
+
+    __slots__ = ("raw", "_status", "_document")
+
+    def __init__(self, raw: bytes, status: str = None):
+        """
+        Args:
+            raw (bytes): The raw JSON payload returned by the service.
+            status (str, optional): The status if already known, sniffed from `raw` otherwise.
+        """
+        self.raw = raw
+        self._status = status
+        self._document = None
+
+    @property
+    def status(self):
+        if self._status is None:
+            self._status = sniff_status(self.raw)
+            if self._status is None:
+                self._status = self._get_document().get("status")
+        return self._status
+
+    def _get_document(self):
+        if self._document is None:
+            self._document = json.loads(self.raw)
+        return self._document
+
+    def to_dict(self):
+        """Returns the fully decoded payload."""
+        return self._get_document()
+
+    def __getitem__(self, key):
+        return self._get_document()[key]
+
+    def __iter__(self):
+        return iter(self._get_document())
+
+    def __len__(self):
+        return len(self._get_document())
+
+    def __repr__(self):
+        return f"LazyAnalyzeResult(status={self.status!r}, size={len(self.raw)} bytes)"
+
+
+def decode_operation_result(body: bytes, result_format: str = "json"):
+    """Reads the status of an operation payload and builds its result in the requested format.
+
+    The payload is decoded at most once. With the "bytes" and "lazy" formats, a successful
+    payload is not decoded at all when its status can be sniffed from the prefix.
+
+    Args:
+        body (bytes): The raw JSON payload of a poll response.
+        result_format (str, optional): "json" for a dict, "bytes" for the raw payload, "lazy"
+            for a `LazyAnalyzeResult`, or "model" for an `AnalyzeResult`. Defaults to "json".
+    Returns:
+        tuple: `(status, result)` with the lower-cased status and the payload in the requested format.
+    """
+    if result_format not in RESULT_FORMATS:
+        raise ValueError(f"Result format must be one of {RESULT_FORMATS}.")
+    if result_format == "model":
+        result = AnalyzeResult.from_bytes(body)
+        return result.status.lower(), result
+    status = None if result_format == "json" else sniff_status(body)
+    if status is None:
+        document = json.loads(body)
+        status = document.get("status")
+        if result_format == "json":
+            return status.lower(), document
+        if result_format == "lazy":
+            result = LazyAnalyzeResult(body, status)
+            result._document = document
+            return status.lower(), result
+    if result_format == "bytes":
+        return status.lower(), body
+    return status.lower(), LazyAnalyzeResult(body, status)
+
+
+_KEYFRAME_PATTERN = re.compile(r"(keyFrame\.(\d+))\.jpg")
+
+
+def get_image_ids(result, include_keyframes: bool = True, include_faces: bool = True):
+    """Collects the IDs of the images referenced by an analyze result, in order of appearance.
+
+    Keyframes are found in the markdown of each content and faces in its "faces" list.
+
+    Args:
+        result (Mapping): The result of the completed operation.
+        include_keyframes (bool, optional): Whether to collect keyframe images. Defaults to True.
+        include_faces (bool, optional): Whether to collect face images. Defaults to True.
+    Returns:
+        list: The unique image IDs, such as "keyFrame.1000" or "face.<faceId>".
+    """
+    image_ids = {}
+    for content in result.get("result", {}).get("contents", []):
+        markdown = content.get("markdown", "")
+        if include_keyframes and isinstance(markdown, str):
+            image_ids.update(
+                dict.fromkeys(match.group(1) for match in _KEYFRAME_PATTERN.finditer(markdown))
+            )
+        faces = content.get("faces", [])
+        if include_faces and isinstance(faces, list):
+            image_ids.update(
+                dict.fromkeys(f"face.{face['faceId']}" for face in faces if face.get("faceId"))
+            )
+    return list(image_ids)
+
+
+class Span:
+    """A range of characters of the markdown of a content."""
+
+    __slots__ = ("offset", "length")
+
+    def __init__(self, offset: int, length: int):
+        self.offset = offset
+        self.length = length
+
+    def __eq__(self, other):
+        return isinstance(other, Span) and (self.offset, self.length) == (other.offset, other.length)
+
+    def __repr__(self):
+        return f"Span(offset={self.offset}, length={self.length})"
+
+
+class Keyframe:
+    """A keyframe image of a video, referenced by the markdown of its content."""
+
+    __slots__ = ("id", "time_ms")
+
+    def __init__(self, id: str, time_ms: int):
+        self.id = id
+        self.time_ms = time_ms
+
+    def __repr__(self):
+        return f"Keyframe(id={self.id!r}, time_ms={self.time_ms})"
+
+
+_UNDECODED = object()
+
+
+class Field:
+    """An extracted field. Its value is decoded from the raw field the first time it is read.
+
+    Values of "date" and "time" fields are `datetime.date` and `datetime.time` when they parse,
+    "array" values are lists of `Field`, and "object" values are dicts of `Field` by name.
+    """
+
+    __slots__ = ("name", "raw", "_value")
+
+    def __init__(self, name: str, raw: dict):
+        """
+        Args:
+            name (str): The name of the field, None for the items of an array.
+            raw (dict): The field as returned by the service.
+        """
+        self.name = name
+        self.raw = raw
+        self._value = _UNDECODED
+
+    @property
+    def type(self) -> str:
+        return self.raw.get("type")
+
+    @property
+    def confidence(self) -> float:
+        return self.raw.get("confidence")
+
+    @property
+    def source(self) -> str:
+        return self.raw.get("source")
+
+    @property
+    def spans(self) -> list:
+        return [Span(span["offset"], span["length"]) for span in self.raw.get("spans", ())]
+
+    @property
+    def value(self):
+        if self._value is _UNDECODED:
+            self._value = self._decode()
+        return self._value
+
+    def _decode(self):
+        field_type = self.type
+        if not field_type:
+            return None
+        value = self.raw.get(f"value{field_type[0].upper()}{field_type[1:]}")
+        if value is None:
+            return None
+        if field_type == "array":
+            return [Field(None, item) for item in value]
+        if field_type == "object":
+            return {name: Field(name, item) for name, item in value.items()}
+        try:
+            if field_type == "date":
+                return datetime.date.fromisoformat(value)
+            if field_type == "time":
+                return datetime.time.fromisoformat(value)
+        except ValueError:
+            pass
+        return value
+
+    def to_python(self):
+        """Returns the value with nested arrays and objects decoded to plain lists and dicts."""
+        value = self.value
+        if isinstance(value, list):
+            return [item.to_python() for item in value]
+        if isinstance(value, dict):
+            return {name: item.to_python() for name, item in value.items()}
+        return value
+
+    def __repr__(self):
+        return f"Field(name={self.name!r}, type={self.type!r})"
+
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+
+def _skip_whitespace(text, position):
+    return _WHITESPACE.match(text, position).end()
+
+
+class _LazyObject:
+    """A JSON object of a payload whose members are decoded only when they are read.
+
+    Members are walked in document order up to the one asked for, keeping the scalars met on
+    the way and the offsets of all values. Arrays and objects walked past are decoded only to
+    find their end, and are not kept.
+    """
+
+    __slots__ = ("_payload", "start", "end", "_position", "_pending", "_offsets", "_values", "_children")
+
+    def __init__(self, payload, start: int):
+        """
+        Args:
+            payload (AnalyzeResult): The owner of the raw payload, providing its text and lock.
+            start (int): The offset of the opening brace in the text of the payload.
+        """
+        self._payload = payload
+        self.start = start
+        # The offset after the closing brace, once every member has been walked.
+        self.end = None
+        self._position = start + 1
+        # The member whose array or object value the walk stopped at, without skipping it.
+        self._pending = None
+        self._offsets = {}
+        self._values = {}
+        self._children = {}
+
+    def get(self, key: str, default=None):
+        """Returns the decoded value of a member, or `default` if the object has no such member."""
+        with self._payload._lock:
+            if key in self._values:
+                return self._values[key]
+            text = self._payload._get_text()
+            offset = self._find(text, key)
+            if offset is None:
+                return default
+            if key not in self._values:
+                self._values[key], end = _DECODER.raw_decode(text, offset)
+                if self._pending == key:
+                    self._position, self._pending = end, None
+            return self._values[key]
+
+    def get_child(self, key: str, wrap=None):
+        """Returns the object or array value of a member as a `_LazyObject` or `_LazyArray`, or None.
+
+        Args:
+            key (str): The name of the member.
+            wrap (callable, optional): For an array, builds the item returned for each object. Defaults to none.
+        """
+        with self._payload._lock:
+            if key not in self._children:
+                text = self._payload._get_text()
+                offset = self._find(text, key)
+                child = None
+                if offset is not None and text[offset] == "{":
+                    child = _LazyObject(self._payload, offset)
+                elif offset is not None and text[offset] == "[":
+                    child = _LazyArray(self._payload, offset, wrap)
+                self._children[key] = child
+            return self._children[key]
+
+    def _find(self, text, key):
+        if key in self._offsets:
+            return self._offsets[key]
+        position = self._position
+        if self._pending is not None:
+            position = self._skip(text, self._pending)
+            self._pending = None
+        while self.end is None:
+            position = _skip_whitespace(text, position)
+            if text[position] == ",":
+                position = _skip_whitespace(text, position + 1)
+            if text[position] == "}":
+                self.end = position + 1
+                break
+            name, position = json.decoder.scanstring(text, position + 1)
+            position = _skip_whitespace(text, _skip_whitespace(text, position) + 1)
+            self._offsets[name] = position
+            if text[position] in "{[":
+                if name == key:
+                    self._position, self._pending = position, name
+                    return position
+                position = self._skip(text, name)
+            else:
+                self._values[name], position = _DECODER.raw_decode(text, position)
+                if name == key:
+                    self._position = position
+                    return self._offsets[name]
+        self._position = position
+        return None
+
+    def _skip(self, text, name):
+        child = self._children.get(name)
+        if child is not None and child.end is not None:
+            return child.end
+        return _DECODER.raw_decode(text, self._offsets[name])[1]
+
+
+class _LazyArray:
+    """A JSON array of objects of a payload, whose items are located and wrapped only when reached."""
+
+    __slots__ = ("_payload", "start", "end", "_items", "_wrap")
+
+    def __init__(self, payload, start: int, wrap=None):
+        """
+        Args:
+            payload (AnalyzeResult): The owner of the raw payload, providing its text and lock.
+            start (int): The offset of the opening bracket in the text of the payload.
+            wrap (callable, optional): Builds the item returned for each `_LazyObject`. Defaults to none.
+        """
+        self._payload = payload
+        self.start = start
+        self.end = None
+        # (lazy object, wrapped item) of the items located so far.
+        self._items = []
+        self._wrap = wrap
+
+    def get(self, index: int):
+        """Returns the item at a non-negative index, or raises IndexError."""
+        with self._payload._lock:
+            text = None
+            while len(self._items) <= index and self.end is None:
+                text = text or self._payload._get_text()
+                self._advance(text)
+            return self._items[index][1]
+
+    def __len__(self):
+        with self._payload._lock:
+            text = None
+            while self.end is None:
+                text = text or self._payload._get_text()
+                self._advance(text)
+            return len(self._items)
+
+    def _advance(self, text):
+        if self._items:
+            last = self._items[-1][0]
+            position = last.end if last.end is not None else _DECODER.raw_decode(text, last.start)[1]
+            position = _skip_whitespace(text, position)
+            if text[position] == ",":
+                position = _skip_whitespace(text, position + 1)
+        else:
+            position = _skip_whitespace(text, self.start + 1)
+        if text[position] == "]":
+            self.end = position + 1
+            return
+        if text[position] != "{":
+            raise ValueError(f"Expected an object at offset {position} of the payload.")
+        item = _LazyObject(self._payload, position)
+        self._items.append((item, self._wrap(item) if self._wrap else item))
+
+
+class _LazyContents(Sequence):
+    """The contents of an `AnalyzeResult`, each decoded the first time it is reached."""
+
+    __slots__ = ("_array",)
+
+    def __init__(self, array: _LazyArray):
+        self._array = array
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+            if index < 0:
+                raise IndexError("content index out of range")
+        return self._array.get(index)
+
+    def __iter__(self):
+        index = 0
+        while True:
+            try:
+                yield self._array.get(index)
+            except IndexError:
+                return
+            index += 1
+
+    def __len__(self):
+        return len(self._array)
+
+    def __repr__(self):
+        return f"<contents of {len(self)}>"
+
+
+class Content:
+    """A content of an analyze result: a document, or a segment of audio or video.
+
+    The modeled attributes are read from the content only when accessed; the rest of the content,
+    such as pages, words and transcript phrases, is read with `AnalyzeResult.to_dict`.
+    """
+
+    __slots__ = ("_source", "_fields")
+
+    def __init__(self, raw):
+        """
+        Args:
+            raw (dict | _LazyObject): The content as returned by the service, decoded or lazy.
+        """
+        self._source = raw
+        self._fields = None
+
+    @property
+    def kind(self) -> str:
+        return self._source.get("kind")
+
+    @property
+    def markdown(self) -> str:
+        return self._source.get("markdown", "")
+
+    @property
+    def start_page_number(self) -> int:
+        return self._source.get("startPageNumber")
+
+    @property
+    def end_page_number(self) -> int:
+        return self._source.get("endPageNumber")
+
+    @property
+    def start_time_ms(self) -> int:
+        return self._source.get("startTimeMs")
+
+    @property
+    def end_time_ms(self) -> int:
+        return self._source.get("endTimeMs")
+
+    @property
+    def _raw_fields(self) -> dict:
+        return self._source.get("fields") or {}
+
+    @property
+    def fields(self) -> dict:
+        """The fields by name; their values are decoded on access."""
+        if self._fields is None:
+            self._fields = {name: Field(name, raw) for name, raw in self._raw_fields.items()}
+        return self._fields
+
+    @property
+    def keyframes(self) -> list:
+        """The keyframes referenced by the markdown, in order of appearance."""
+        keyframes = {}
+        for match in _KEYFRAME_PATTERN.finditer(self.markdown):
+            keyframes.setdefault(match.group(1), Keyframe(match.group(1), int(match.group(2))))
+        return list(keyframes.values())
+
+    def __repr__(self):
+        return f"Content(kind={self.kind!r}, fields={len(self._raw_fields)})"
+
+
+class AnalyzeResult:
+    """Typed, compact model of the payload of a completed analyze operation.
+
+    Only the text of the payload is kept, which for ASCII payloads takes as much memory as their
+    bytes. Its members are located by walking the JSON text and decoded the first time they are
+    read, so the first field of the first content is available without decoding the other
+    contents, nor the members following "fields" in its content. Accessing a later content
+    decodes the earlier ones once, transiently, to find where it starts.
+    """
+
+    __slots__ = ("_text", "_root", "_result", "_contents", "_lock")
+
+    def __init__(self, raw: bytes):
+        """
+        Args:
+            raw (bytes | str): The raw JSON payload returned by the service.
+
+        Raises:
+            ValueError: If the payload is not a JSON object.
+        """
+        text = self._text = raw if isinstance(raw, str) else bytes(raw).decode("utf-8")
+        self._lock = threading.RLock()
+        start = _skip_whitespace(text, 0)
+        if text[start : start + 1] != "{":
+            raise ValueError("The payload of an operation must be a JSON object.")
+        self._root = _LazyObject(self, start)
+        self._result = self._root.get_child("result")
+        if not isinstance(self._result, _LazyObject):
+            self._result = None
+        self._contents = None
+
+    @classmethod
+    def from_bytes(cls, raw: bytes):
+        """Builds the model of a raw JSON payload."""
+        return cls(raw)
+
+    @property
+    def raw(self) -> bytes:
+        """The raw JSON payload."""
+        return self._text.encode("utf-8")
+
+    def _get_text(self):
+        return self._text
+
+    @property
+    def id(self) -> str:
+        return self._root.get("id")
+
+    @property
+    def status(self) -> str:
+        return self._root.get("status")
+
+    @property
+    def analyzer_id(self) -> str:
+        return self._result.get("analyzerId") if self._result is not None else None
+
+    @property
+    def created_at(self) -> str:
+        return self._result.get("createdAt") if self._result is not None else None
+
+    @property
+    def warnings(self) -> list:
+        return (self._result.get("warnings") if self._result is not None else None) or []
+
+    @property
+    def contents(self):
+        """The `Content`s of the result, as a sequence decoding each content when first reached."""
+        if self._contents is None:
+            array = self._result.get_child("contents", Content) if self._result is not None else None
+            if isinstance(array, _LazyArray):
+                self._contents = _LazyContents(array)
+            else:
+                self._contents = ()
+        return self._contents
+
+    def iter_fields(self):
+        """Yields the fields of every content, in content order, without building a list."""
+        for content in self.contents:
+            yield from content.fields.values()
+
+    def get_field(self, name: str) -> Field:
+        """Returns the first field with the given name across contents, or None."""
+        for content in self.contents:
+            if name in content._raw_fields:
+                return content.fields[name]
+        return None
+
+    def to_dict(self) -> dict:
+        """Returns the fully decoded payload."""
+        return json.loads(self._text)
+
+    def __repr__(self):
+        return f"AnalyzeResult(status={self.status!r}, size={len(self._text)} characters)"
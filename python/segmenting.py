@@ -0,0 +1,191 @@
+import io
+import json
+import re
+import subprocess
+from collections import namedtuple
+from pathlib import Path
+
+from .analyze_inputs import BINARY_TYPES, is_local_file
+
+# A part of a larger input: its content (bytes or a local path) and where it starts in the
+# original input, in pages and in milliseconds.
+Segment = namedtuple("Segment", ("content", "page_offset", "time_offset_ms"))
+
+# Keys holding one-based page numbers, and the page of the bounding polygons in field sources.
+_PAGE_KEYS = frozenset(("pageNumber", "startPageNumber", "endPageNumber"))
+_SOURCE_PAGE_PATTERN = re.compile(r"D\((\d+),")
+_MARKDOWN_SEPARATOR = "\n"
+
+
+def split_pdf(file_location, pages_per_segment: int = 50):
+    """Splits a PDF into documents of at most `pages_per_segment` pages, locally.
+
+    Requires the optional `pypdf` package.
+
+    Args:
+        file_location (str | Path | BinaryIO | bytes): The path to the PDF, a binary stream or its content.
+        pages_per_segment (int, optional): The maximum number of pages of each segment. Defaults to 50.
+    Returns:
+        list: The `Segment`s, whose content is the bytes of a PDF holding a page range of the input.
+    """
+    try:
+        from pypdf import PdfReader, PdfWriter
+    except ImportError as e:
+        raise ImportError("Splitting PDFs requires pypdf: pip install pypdf") from e
+    if pages_per_segment < 1:
+        raise ValueError("Pages per segment must be at least 1.")
+    if isinstance(file_location, BINARY_TYPES):
+        file_location = io.BytesIO(file_location)
+    reader = PdfReader(file_location)
+    segments = []
+    for start in range(0, len(reader.pages), pages_per_segment):
+        writer = PdfWriter()
+        for page in reader.pages[start : start + pages_per_segment]:
+            writer.add_page(page)
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        segments.append(Segment(buffer.getvalue(), start, 0))
+    return segments
+
+
+def _probe_duration_seconds(path) -> float:
+    output = subprocess.run(
+        [
+            "ffprobe", "-v", "error", "-show_entries", "format=duration",
+            "-of", "json", str(path),
+        ],
+        check=True,
+        capture_output=True,
+    ).stdout
+    return float(json.loads(output)["format"]["duration"])
+
+
+def split_media(file_location, output_directory, segment_seconds: float = 600):
+    """Splits an audio or video file into files of about `segment_seconds`, locally.
+
+    Requires `ffmpeg` and `ffprobe` on the PATH. Streams are copied without re-encoding, so cuts
+    fall on the nearest keyframe; the actual duration of every segment is probed, so the time
+    offsets are exact.
+
+    Args:
+        file_location (str | Path): The path to the audio or video file.
+        output_directory (str | Path): An existing directory the segment files are written to.
+        segment_seconds (float, optional): The target duration of each segment. Defaults to 600.
+    Returns:
+        list: The `Segment`s, whose content is the path of a segment file.
+    """
+    if segment_seconds <= 0:
+        raise ValueError("Segment duration must be positive.")
+    if not is_local_file(file_location):
+        raise ValueError("Only local audio and video files can be split.")
+    suffix = Path(file_location).suffix
+    subprocess.run(
+        [
+            "ffmpeg", "-v", "error", "-i", str(file_location), "-map", "0", "-c", "copy",
+            "-f", "segment", "-segment_time", str(segment_seconds), "-reset_timestamps", "1",
+            str(Path(output_directory) / f"segment%05d{suffix}"),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    segments = []
+    time_offset_ms = 0
+    for path in sorted(Path(output_directory).glob(f"segment*{suffix}")):
+        segments.append(Segment(str(path), 0, time_offset_ms))
+        time_offset_ms += round(_probe_duration_seconds(path) * 1000)
+    return segments
+
+
+def _shift_span(span, text_offset):
+    if isinstance(span, dict) and isinstance(span.get("offset"), int):
+        return dict(span, offset=span["offset"] + text_offset)
+    return span
+
+
+def _shift(value, text_offset, page_offset, time_offset_ms):
+    """Returns a copy of a result element with its spans, pages and times moved by the offsets."""
+    if isinstance(value, list):
+        return [_shift(item, text_offset, page_offset, time_offset_ms) for item in value]
+    if not isinstance(value, dict):
+        return value
+    shifted = {}
+    for key, item in value.items():
+        if key == "span":
+            shifted[key] = _shift_span(item, text_offset)
+        elif key == "spans" and isinstance(item, list):
+            shifted[key] = [_shift_span(span, text_offset) for span in item]
+        elif key in _PAGE_KEYS and isinstance(item, int):
+            shifted[key] = item + page_offset
+        elif key.endswith("TimeMs") and isinstance(item, (int, float)):
+            shifted[key] = item + time_offset_ms
+        elif key == "source" and isinstance(item, str) and page_offset:
+            shifted[key] = _SOURCE_PAGE_PATTERN.sub(
+                lambda match: f"D({int(match.group(1)) + page_offset},", item
+            )
+        else:
+            shifted[key] = _shift(item, text_offset, page_offset, time_offset_ms)
+    return shifted
+
+
+def _merge_document(merged, content):
+    """Appends a shifted document content to the merged one, in place."""
+    for key, value in content.items():
+        if key == "markdown":
+            merged[key] = merged.get(key, "") + _MARKDOWN_SEPARATOR + value
+        elif key == "fields" and isinstance(value, dict):
+            # Each field keeps the value found in the earliest segment.
+            fields = merged.setdefault(key, {})
+            for name, field in value.items():
+                fields.setdefault(name, field)
+        elif key == "endPageNumber":
+            merged[key] = value
+        elif isinstance(value, list):
+            merged.setdefault(key, []).extend(value)
+        else:
+            merged.setdefault(key, value)
+
+
+def merge_segment_results(segments, results) -> dict:
+    """Merges the results of the segments of an input into the result of the whole input.
+
+    Document contents are merged into one, with their markdown concatenated and the span
+    offsets and page numbers remapped to the whole document. Audio and video contents are
+    kept apart, with their times remapped to the whole recording. Each field keeps the value
+    of the earliest segment it was found in, and the warnings of all segments are kept.
+
+    Keyframe and face image IDs still refer to the operation of their segment, and timestamps
+    written inside markdown text are not rewritten.
+
+    Args:
+        segments (list): The `Segment`s, in input order.
+        results (list): The result payloads of the segments, in the same order.
+    Returns:
+        dict: The result payload of the whole input.
+    """
+    if len(segments) != len(results) or not results:
+        raise ValueError("There must be one result per segment.")
+    merged = dict(results[0])
+    merged_result = dict(results[0].get("result", {}))
+    contents = []
+    warnings = []
+    document = None
+    for segment, result in zip(segments, results):
+        payload = result.get("result", {})
+        warnings.extend(payload.get("warnings", []))
+        for content in payload.get("contents", []):
+            if content.get("kind") != "document":
+                contents.append(_shift(content, 0, segment.page_offset, segment.time_offset_ms))
+            elif document is None:
+                document = _shift(content, 0, segment.page_offset, segment.time_offset_ms)
+                contents.append(document)
+            else:
+                text_offset = len(document.get("markdown", "")) + len(_MARKDOWN_SEPARATOR)
+                _merge_document(
+                    document,
+                    _shift(content, text_offset, segment.page_offset, segment.time_offset_ms),
+                )
+    merged_result["contents"] = contents
+    merged_result["warnings"] = warnings
+    merged["result"] = merged_result
+    return merged
+
@@ -0,0 +1,55 @@
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Coalesces concurrent calls sharing a key onto a single execution.
+
+    The first caller of a key runs the function; callers arriving while it runs wait for it
+    and receive the same result, or the same exception. Once the call completes the key is
+    forgotten, so later callers run the function again: this only covers the window before
+    a result exists, persistent caching is left to a `ResultCache`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.coalesced = 0
+
+    def __len__(self):
+        """Returns the number of calls in flight."""
+        with self._lock:
+            return len(self._calls)
+
+    def do(self, key, function: callable):
+        """Runs `function` unless a call with the same key is in flight, and returns its result.
+
+        Args:
+            key (Hashable): The key identifying identical calls.
+            function (callable): The function to run, without arguments.
+        Returns:
+            The return value of the function, shared by every caller of the key.
+        Raises:
+            Exception: The exception raised by the function, raised to every caller of the key.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._calls[key] = future
+            else:
+                self.coalesced += 1
+        if not is_leader:
+            return future.result()
+        try:
+            result = function()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
@@ -0,0 +1,118 @@
+import math
+import threading
+import time
+
+# Status codes the service returns when the resource is over its quota or overloaded.
+RETRYABLE_STATUS_CODES = frozenset((429, 503))
+
+
+class TokenBucketRateLimiter:
+    """Limits the request rate with a token bucket, shareable across threads and clients.
+
+    Tokens accumulate at `requests_per_second` up to `burst`. Each request takes one token;
+    when the bucket is empty the request waits until its token has accumulated.
+    """
+
+    def __init__(self, requests_per_second: float, burst: int = None):
+        """
+        Args:
+            requests_per_second (float): The sustained request rate.
+            burst (int, optional): The number of requests allowed back to back after idling.
+                Defaults to one second worth of requests.
+        """
+        if requests_per_second <= 0:
+            raise ValueError("Requests per second must be positive.")
+        self.requests_per_second = requests_per_second
+        self.burst = burst or max(1, math.ceil(requests_per_second))
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Takes a token and returns how many seconds the caller must wait before sending.
+
+        The token is reserved immediately, so concurrent callers are queued fairly. Callers
+        on an event loop can await the returned delay instead of blocking.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated_at) * self.requests_per_second
+            )
+            self._updated_at = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.requests_per_second
+
+    def acquire(self):
+        """Blocks until the caller may send a request."""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class AdaptiveConcurrencyLimiter:
+    """Bounds the requests in flight with a limit adapted by additive-increase/multiplicative-decrease.
+
+    Every successful request grows the limit by about `increase` per window of requests, and
+    a throttled one shrinks it by `decrease_factor`, at most once per `decrease_cooldown_seconds`
+    so a burst of throttled responses to the same window only counts once.
+    """
+
+    def __init__(
+        self,
+        initial_limit: float = 8,
+        min_limit: float = 1,
+        max_limit: float = 64,
+        increase: float = 1,
+        decrease_factor: float = 0.5,
+        decrease_cooldown_seconds: float = 1,
+    ):
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Limits must satisfy 1 <= min_limit <= initial_limit <= max_limit.")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("Decrease factor must be in (0, 1).")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown_seconds = decrease_cooldown_seconds
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """The current number of requests allowed in flight."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self):
+        """Blocks until a request slot is available and takes it."""
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self, throttled: bool = None):
+        """Frees a request slot and adapts the limit to the outcome of the request.
+
+        Args:
+            throttled (bool, optional): True if the service throttled the request, False if it was
+                accepted, None to leave the limit unchanged (e.g. on a connection error).
+        """
+        with self._condition:
+            self._in_flight -= 1
+            if throttled:
+                now = time.monotonic()
+                if now - self._last_decrease >= self.decrease_cooldown_seconds:
+                    self._limit = max(self.min_limit, self._limit * self.decrease_factor)
+                    self._last_decrease = now
+            elif throttled is not None:
+                self._limit = min(self.max_limit, self._limit + self.increase / self._limit)
+            self._condition.notify_all()
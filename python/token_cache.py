@@ -0,0 +1,112 @@
+import base64
+import json
+import logging
+import threading
+import time
+
+
+class TokenCache:
+    """Caches a bearer token with its expiry and refreshes it ahead of time.
+
+    Requests read the cached token without calling the credential. The first `get_token` within
+    `refresh_margin_seconds` of the expiry starts a single background refresh and still returns
+    the cached token; only once the token has expired does `get_token` refresh on the calling
+    thread. No thread outlives a refresh, so a cache nobody uses costs nothing.
+    """
+
+    def __init__(
+        self,
+        token_provider: callable,
+        refresh_margin_seconds: float = 300,
+        default_lifetime_seconds: float = 3600,
+        retry_interval_seconds: float = 10,
+    ):
+        """
+        Args:
+            token_provider (callable): A callable returning a bearer token string, or an object with
+                `token` and `expires_on` attributes such as `azure.core.credentials.AccessToken`.
+            refresh_margin_seconds (float, optional): How long before expiry to refresh. Defaults to 300.
+            default_lifetime_seconds (float, optional): The lifetime assumed when the expiry cannot be
+                read from the token. Defaults to 3600.
+            retry_interval_seconds (float, optional): The wait before retrying a failed background refresh. Defaults to 10.
+        """
+        self._token_provider = token_provider
+        self._refresh_margin = refresh_margin_seconds
+        self._default_lifetime = default_lifetime_seconds
+        self._retry_interval = retry_interval_seconds
+        self._logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._token = None
+        self._expires_on = 0.0
+        self._refresh_at = 0.0
+        self._refreshing = False
+        self._closed = False
+        with self._lock:
+            self._refresh()
+
+    @property
+    def expires_on(self) -> float:
+        return self._expires_on
+
+    def get_token(self) -> str:
+        """Returns a valid token, refreshing it on the calling thread only if it has expired."""
+        token, expires_on = self._token, self._expires_on
+        now = time.time()
+        if now < expires_on:
+            if now >= self._refresh_at:
+                self._start_background_refresh(now)
+            return token
+        with self._lock:
+            if time.time() >= self._expires_on:
+                self._refresh()
+            return self._token
+
+    def close(self):
+        """Stops refreshing the token in the background; `get_token` still refreshes an expired one."""
+        with self._lock:
+            self._closed = True
+
+    def _refresh(self):
+        # Callers hold the lock.
+        token, expires_on = self._parse_token(self._token_provider())
+        self._token, self._expires_on = token, expires_on
+        now = time.time()
+        remaining = expires_on - now
+        # Short-lived tokens are refreshed halfway through instead of immediately.
+        self._refresh_at = now + max(remaining - self._refresh_margin, remaining / 2, 1.0)
+        self._logger.info(f"Access token refreshed, valid for {remaining:.0f} seconds.")
+
+    def _start_background_refresh(self, now):
+        with self._lock:
+            if self._closed or self._refreshing or now < self._refresh_at:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh_in_background, name="cu-token-refresh", daemon=True).start()
+
+    def _refresh_in_background(self):
+        with self._lock:
+            try:
+                self._refresh()
+            except Exception as e:
+                self._logger.warning(f"Background token refresh failed, retrying: {e}")
+                self._refresh_at = time.time() + self._retry_interval
+            finally:
+                self._refreshing = False
+
+    def _parse_token(self, value):
+        """Returns the token string and its expiry as a Unix timestamp."""
+        if hasattr(value, "token") and hasattr(value, "expires_on"):
+            return value.token, float(value.expires_on)
+        expires_on = self._read_jwt_expiry(value)
+        if expires_on is None:
+            expires_on = time.time() + self._default_lifetime
+        return value, expires_on
+
+    def _read_jwt_expiry(self, token):
+        """Reads the "exp" claim of a JWT without validating it, or returns None."""
+        try:
+            payload = token.split(".")[1]
+            payload += "=" * (-len(payload) % 4)
+            return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+        except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+            return None